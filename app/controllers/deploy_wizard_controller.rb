@@ -167,7 +167,7 @@ class DeployWizardController < ApplicationController
 
   def detect_repo_default_branch(repo)
     url   = repo.authenticated_clone_url
-    out   = `git ls-remote --symref #{Shellwords.escape(url)} HEAD 2>&1`
+    out   = IO.popen(["git", "ls-remote", "--symref", url, "HEAD"], err: [:child, :out], &:read)
     match = out.match(%r{ref: refs/heads/(\S+)\s+HEAD})
     match&.captures&.first
   rescue
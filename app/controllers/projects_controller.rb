@@ -264,8 +264,7 @@ class ProjectsController < ApplicationController
         cicd_setup_status: "committed",
         cicd_committed_at: Time.current
       )
-      redirect_to setup_cicd_project_path(@project),
-                  notice: "#{result.committed_files.size} file(s) committed to #{@project.repository.full_name}."
+      redirect_to setup_cicd_project_path(@project), notice: commit_notice(result)
     else
       redirect_to setup_cicd_project_path(@project),
                   alert: "Failed to commit files: #{result.error}"
@@ -278,6 +277,20 @@ class ProjectsController < ApplicationController
     @project = current_user.projects.find(params[:id])
   end
 
+  def commit_notice(result)
+    repo = @project.repository.full_name
+    committed = result.committed_files.size
+    skipped   = result.skipped_files.size
+
+    if committed.zero?
+      "All #{skipped} file(s) are already up to date in #{repo}."
+    elsif skipped.zero?
+      "#{committed} file(s) committed to #{repo}."
+    else
+      "#{committed} file(s) committed to #{repo}; #{skipped} already up to date."
+    end
+  end
+
   def project_params
     params.require(:project).permit(
       :name, :repository_id, :gcp_project_id, :gcp_region,
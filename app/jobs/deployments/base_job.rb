@@ -6,6 +6,10 @@ module Deployments
     # in a terminal "failed" state. The user re-triggers from the UI.
     sidekiq_options retry: 0
 
+    LOG_BATCH_SIZE     = 50
+    LOG_FLUSH_INTERVAL = 0.5 # seconds
+    READ_CHUNK_BYTES   = 4096
+
     private
 
     # Finds the deployment and yields to the block.
@@ -50,36 +54,41 @@ module Deployments
       ExplainErrorJob.perform_later(deployment.id)
     end
 
-    # Runs a gcloud command authenticated via OAuth token (preferred) or service account key.
-    def run_gcloud!(cmd, deployment:, source: "system")
+    # Returns a bearer token for calling Google Cloud REST APIs directly,
+    # skipping the gcloud CLI start-up entirely.
+    def gcp_access_token!(deployment)
       user = deployment.project.user
+      ensure_google_connected!(user)
+      user.gcp_access_token
+    end
 
-      unless user.google_connected?
-        raise Deployments::DeploymentError,
-              "Google Cloud not connected. Connect via OAuth or add a service account key in Settings."
-      end
+    def ensure_google_connected!(user)
+      return if user.google_connected?
+
+      raise Deployments::DeploymentError,
+            "Google Cloud not connected. Connect via OAuth or add a service account key in Settings."
+    end
+
+    # Runs a gcloud command authenticated via OAuth token (preferred) or service account key.
+    # `argv` is the full command as an array (e.g. [Gcp::ShellEnv::GCLOUD, "run", "deploy", ...]); it is
+    # exec'd directly, with no intermediate shell and no quoting to get wrong.
+    def run_gcloud!(argv, deployment:, source: "system")
+      user = deployment.project.user
+      ensure_google_connected!(user)
 
       output_lines = []
 
       if user.google_oauth_connected?
         token = user.fresh_google_token!
         env = Gcp::ShellEnv.with_token(token)
-        IO.popen(env, "#{cmd} 2>&1") do |io|
-          io.each_line do |raw|
-            line = raw.chomp
-            output_lines << line
-            deployment.append_log(line, source: source) if line.present?
-          end
+        IO.popen(env, argv, err: [:child, :out]) do |io|
+          stream_output(io, deployment, source, output_lines)
         end
       else
         user.with_gcp_credentials_file do |key_path|
           env = Gcp::ShellEnv.with_key(key_path)
-          IO.popen(env, "#{cmd} 2>&1") do |io|
-            io.each_line do |raw|
-              line = raw.chomp
-              output_lines << line
-              deployment.append_log(line, source: source) if line.present?
-            end
+          IO.popen(env, argv, err: [:child, :out]) do |io|
+            stream_output(io, deployment, source, output_lines)
           end
         end
       end
@@ -91,5 +100,54 @@ module Deployments
 
       output_lines.join("\n")
     end
+
+    # Copies command output into output_lines and the deployment log. Lines are
+    # written in batches (one INSERT + one broadcast each) instead of one per
+    # line; a batch is flushed once it is full or its first line has waited
+    # LOG_FLUSH_INTERVAL. Output is read in chunks rather than with gets, so a
+    # half-written line (gcloud's "Creating Revision....." progress dots) never
+    # holds back the finished lines before it.
+    def stream_output(io, deployment, source, output_lines)
+      pending       = []
+      pending_since = nil
+      buffer        = String.new(encoding: Encoding::BINARY)
+
+      loop do
+        if pending.any?
+          wait = LOG_FLUSH_INTERVAL - (Process.clock_gettime(Process::CLOCK_MONOTONIC) - pending_since)
+          if wait <= 0 || !io.wait_readable(wait)
+            deployment.append_logs(pending, source: source)
+            pending = []
+          end
+        end
+
+        begin
+          buffer << io.readpartial(READ_CHUNK_BYTES)
+        rescue EOFError
+          break
+        end
+
+        while (newline = buffer.index("\n"))
+          line = buffer.slice!(0..newline).chomp.force_encoding(Encoding.default_external)
+          output_lines << line
+          next unless line.present?
+
+          pending_since = Process.clock_gettime(Process::CLOCK_MONOTONIC) if pending.empty?
+          pending << [line, Time.current]
+          next if pending.size < LOG_BATCH_SIZE
+
+          deployment.append_logs(pending, source: source)
+          pending = []
+        end
+      end
+
+      unless buffer.empty?
+        line = buffer.force_encoding(Encoding.default_external)
+        output_lines << line
+        pending << [line, Time.current] if line.present?
+      end
+
+      deployment.append_logs(pending, source: source) if pending.any?
+    end
   end
 end
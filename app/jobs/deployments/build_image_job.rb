@@ -45,14 +45,14 @@ module Deployments
       # --no-source is not used here — gcloud builds submit handles the GCS upload
       # automatically when given a local directory.
       cmd = [
-        "gcloud builds submit",
-        "--project=#{Shellwords.escape(project.gcp_project_id)}",
-        "--tag=#{Shellwords.escape(image_url)}",
+        Gcp::ShellEnv::GCLOUD, "builds", "submit",
+        "--project=#{project.gcp_project_id}",
+        "--tag=#{image_url}",
         "--timeout=30m",
         "--async",           # return immediately with a build ID; poll separately
         "--format=value(id)",
-        Shellwords.escape(repo_path)
-      ].join(" ")
+        repo_path.to_s
+      ]
 
       output = run_gcloud!(cmd, deployment: deployment, source: "cloud_build")
       build_id = output.lines.map(&:strip).reject(&:empty?).last
@@ -61,10 +61,10 @@ module Deployments
 
     def build_command(deployment, project, env_vars_file_path)
       parts = [
-        "gcloud run deploy #{Shellwords.escape(project.service_name)}",
-        "--project=#{Shellwords.escape(project.gcp_project_id)}",
-        "--region=#{Shellwords.escape(project.gcp_region)}",
-        "--image=#{Shellwords.escape(deployment.image_url)}",
+        Gcp::ShellEnv::GCLOUD, "run", "deploy", project.service_name.to_s,
+        "--project=#{project.gcp_project_id}",
+        "--region=#{project.gcp_region}",
+        "--image=#{deployment.image_url}",
         "--platform=managed",
         "--allow-unauthenticated",
         "--port=#{container_port(project)}",
@@ -76,9 +76,8 @@ module Deployments
       ]
 
       # Use --env-vars-file (YAML key: value) to avoid injection via commas/equals in values.
-      parts << "--env-vars-file=#{Shellwords.escape(env_vars_file_path)}" if env_vars_file_path
-
-      parts.join(" \\\n  ")
+      parts << "--env-vars-file=#{env_vars_file_path}" if env_vars_file_path
+      parts
     end
 
     def extract_url(output, project)
@@ -1,7 +1,11 @@
+require "google/apis/cloudbuild_v1"
+
 module Deployments
   # Step 3 of the deployment pipeline.
   #
   # Polls the Cloud Build status every N seconds using exponential backoff.
+  # Status is read from the Cloud Build REST API rather than `gcloud builds
+  # describe`, so each poll is one HTTPS request instead of a gcloud start-up.
   # Re-enqueues itself until the build reaches a terminal state, then either:
   #   - SUCCESS  → enqueues DeployToCloudRunJob
   #   - FAILURE / CANCELLED / TIMEOUT → fails the deployment
@@ -27,11 +31,14 @@ module Deployments
                   "Cloud Build timed out after #{MAX_ATTEMPTS} polling attempts (~28 minutes)."
           end
 
-          state = fetch_build_state(deployment, build_id)
+          build = fetch_build(deployment, build_id)
+          state = build.status.to_s.upcase
+          raise Deployments::DeploymentError, "Could not fetch build status" if state.blank?
+
           deployment.append_log("Build status: #{state} (poll ##{attempt})", level: "debug")
 
           if TERMINAL_STATES.include?(state)
-            handle_terminal_state(deployment, build_id, state)
+            handle_terminal_state(deployment, build, state)
           else
             # Not done yet — re-enqueue after a backoff delay.
             delay = backoff_seconds(attempt)
@@ -45,43 +52,29 @@ module Deployments
 
     private
 
-    def fetch_build_state(deployment, build_id)
-      cmd = [
-        "gcloud builds describe #{Shellwords.escape(build_id)}",
-        "--project=#{Shellwords.escape(deployment.project.gcp_project_id)}",
-        "--format=value(status)"
-      ].join(" ")
-
-      output = run_gcloud!(cmd, deployment: deployment, source: "cloud_build")
-      state = output.lines.map(&:strip).reject(&:empty?).last.to_s
-      raise Deployments::DeploymentError, "Could not fetch build status" if state.blank?
-      state.upcase
+    def fetch_build(deployment, build_id)
+      service = Google::Apis::CloudbuildV1::CloudBuildService.new
+      service.authorization = gcp_access_token!(deployment)
+      service.get_project_build(deployment.project.gcp_project_id, build_id)
+    rescue Google::Apis::Error => e
+      raise Deployments::DeploymentError, "Could not fetch build status: #{e.message}"
+    rescue Signet::AuthorizationError => e
+      raise Deployments::DeploymentError, "Could not authenticate with Google Cloud: #{e.message}"
     end
 
-    def handle_terminal_state(deployment, build_id, state)
+    def handle_terminal_state(deployment, build, state)
       if state == SUCCESS_STATE
-        log_url = build_log_url(build_id, deployment.project.gcp_project_id)
+        log_url = build_log_url(build.id, deployment.project.gcp_project_id)
         deployment.update!(cloud_build_log_url: log_url)
         deployment.append_log("Build succeeded.")
         deployment.append_log("Logs: #{log_url}")
         DeployToCloudRunJob.perform_later(deployment.id)
       else
-        detail = fetch_failure_detail(deployment, build_id)
+        detail = build.failure_info&.detail.presence || "see Cloud Build logs for details"
         raise Deployments::DeploymentError, "Cloud Build #{state.downcase}: #{detail}"
       end
     end
 
-    def fetch_failure_detail(deployment, build_id)
-      cmd = [
-        "gcloud builds describe #{Shellwords.escape(build_id)}",
-        "--project=#{Shellwords.escape(deployment.project.gcp_project_id)}",
-        "--format=value(failureInfo.detail)"
-      ].join(" ")
-      run_gcloud!(cmd, deployment: deployment, source: "cloud_build").strip
-    rescue
-      "see Cloud Build logs for details"
-    end
-
     def build_log_url(build_id, gcp_project_id)
       "https://console.cloud.google.com/cloud-build/builds/#{build_id}?project=#{gcp_project_id}"
     end
@@ -96,8 +96,7 @@ module Deployments
 
       begin
         run_git!(
-          "clone --depth=1 --branch #{Shellwords.escape(target_branch)} " \
-          "#{Shellwords.escape(clone_url)} #{Shellwords.escape(repo_path)}",
+          ["clone", "--depth=1", "--branch", target_branch, clone_url, repo_path],
           deployment: deployment,
           redact: clone_url
         )
@@ -112,8 +111,7 @@ module Deployments
             repository.update_columns(default_branch: actual)
             target_branch = actual
             run_git!(
-              "clone --depth=1 --branch #{Shellwords.escape(actual)} " \
-              "#{Shellwords.escape(clone_url)} #{Shellwords.escape(repo_path)}",
+              ["clone", "--depth=1", "--branch", actual, clone_url, repo_path],
               deployment: deployment,
               redact: clone_url
             )
@@ -125,9 +123,9 @@ module Deployments
         end
       end
 
-      sha     = capture_git!("rev-parse HEAD",      repo_path)
-      message = capture_git!("log -1 --pretty=%s",  repo_path)
-      author  = capture_git!("log -1 --pretty=%an", repo_path)
+      sha     = capture_git!(%w[rev-parse HEAD],      repo_path)
+      message = capture_git!(%w[log -1 --pretty=%s],  repo_path)
+      author  = capture_git!(%w[log -1 --pretty=%an], repo_path)
 
       deployment.update!(
         commit_sha:     sha.strip,
@@ -141,7 +139,7 @@ module Deployments
     end
 
     def detect_default_branch(clone_url)
-      out   = `git ls-remote --symref #{Shellwords.escape(clone_url)} HEAD 2>&1`
+      out   = IO.popen(["git", "ls-remote", "--symref", clone_url, "HEAD"], err: [:child, :out], &:read)
       match = out.match(%r{ref: refs/heads/(\S+)\s+HEAD})
       match&.captures&.first
     rescue
@@ -207,13 +205,12 @@ module Deployments
     # Shell helpers                                                        #
     # ------------------------------------------------------------------ #
 
-    # Runs a `git <args>` command, streaming output to deployment logs.
+    # Runs `git *args` (an argv array, no shell), streaming output to deployment logs.
     # Pass `redact:` to replace a secret string with "[REDACTED]" in logs.
     def run_git!(args, deployment:, redact: nil)
-      cmd = "git #{args} 2>&1"
       output_lines = []
 
-      IO.popen(cmd) do |io|
+      IO.popen(["git", *args], err: [:child, :out]) do |io|
         io.each_line do |raw|
           line = raw.chomp
           line = line.gsub(redact, "[REDACTED]") if redact
@@ -223,7 +220,7 @@ module Deployments
 
       unless $?.success?
         raise Deployments::DeploymentError,
-              "git #{args.split.first} failed (exit #{$?.exitstatus}):\n" \
+              "git #{args.first} failed (exit #{$?.exitstatus}):\n" \
               "#{output_lines.last(10).join("\n")}"
       end
 
@@ -231,8 +228,8 @@ module Deployments
     end
 
     def capture_git!(args, repo_path)
-      out = `git -C #{Shellwords.escape(repo_path)} #{args} 2>&1`
-      raise Deployments::DeploymentError, "git #{args} failed: #{out}" unless $?.success?
+      out = IO.popen(["git", "-C", repo_path.to_s, *args], err: [:child, :out], &:read)
+      raise Deployments::DeploymentError, "git #{args.join(" ")} failed: #{out}" unless $?.success?
       out
     end
 
@@ -51,8 +51,10 @@ module Projects
       branch     = project.production_branch.presence || repository.default_branch
       clone_url  = repository.authenticated_clone_url
 
-      output = `git clone --depth=1 --branch #{Shellwords.escape(branch)} \
-                #{Shellwords.escape(clone_url)} #{Shellwords.escape(repo_path)} 2>&1`
+      output = IO.popen(
+        ["git", "clone", "--depth=1", "--branch", branch, clone_url, repo_path],
+        err: [:child, :out], &:read
+      )
 
       unless $?.success?
         safe_output = output.gsub(clone_url, "[REDACTED]")
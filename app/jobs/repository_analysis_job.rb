@@ -2,6 +2,10 @@ class RepositoryAnalysisJob < ApplicationJob
   queue_as :default
   sidekiq_options retry: 2
 
+  # The AI prompt keeps the first 2,000 characters of the README; 8 KB covers
+  # that even for multibyte text without loading a huge README in full.
+  README_BYTES = 8 * 1024
+
   def perform(project_id)
     project    = Project.find_by(id: project_id)
     return unless project
@@ -13,8 +17,9 @@ class RepositoryAnalysisJob < ApplicationJob
 
     clone_repo(repository, project, repo_path)
 
-    result      = RepositoryAnalyzer.new(repo_path, project).call
-    enriched    = enrich_with_ai(result.to_h, repo_path)
+    analyzer    = RepositoryAnalyzer.new(repo_path, project)
+    result      = analyzer.call
+    enriched    = enrich_with_ai(result.to_h, repo_path, analyzer.files.tree)
 
     project.update_columns(
       analysis_status: "complete",
@@ -43,14 +48,11 @@ class RepositoryAnalysisJob < ApplicationJob
     )
   end
 
-  def enrich_with_ai(analysis_hash, repo_path)
-    file_tree = Dir.glob("#{repo_path}/**/*", File::FNM_DOTMATCH)
-                   .reject { |f| File.directory?(f) }
-                   .map    { |f| f.sub("#{repo_path}/", "") }
-                   .reject { |f| f.start_with?(".git/", "node_modules/", "vendor/") }
-
+  def enrich_with_ai(analysis_hash, repo_path, file_tree)
     readme_path = Dir.glob("#{repo_path}/README{,.md,.txt}", File::FNM_CASEFOLD).first
-    readme      = File.read(readme_path) if readme_path && File.exist?(readme_path)
+    if readme_path && File.exist?(readme_path)
+      readme = File.read(readme_path, README_BYTES).to_s.force_encoding(Encoding::UTF_8).scrub
+    end
 
     Ai::RepositoryAnalyzer.new(analysis_hash, file_tree: file_tree, readme: readme).call
   rescue => e
@@ -65,15 +67,20 @@ class RepositoryAnalysisJob < ApplicationJob
     branch    = project.production_branch.presence || repository.default_branch
     clone_url = repository.authenticated_clone_url
 
-    output = `git clone --depth=1 --branch #{Shellwords.escape(branch)} \
-              #{Shellwords.escape(clone_url)} #{Shellwords.escape(repo_path)} 2>&1`
+    output = IO.popen(
+      ["git", "clone", "--depth=1", "--branch", branch, clone_url, repo_path],
+      err: [:child, :out], &:read
+    )
 
     # If the branch wasn't found, clone without specifying one (use repo default)
     if !$?.success? && output.include?("Remote branch") && output.include?("not found")
       FileUtils.rm_rf(repo_path)
       actual_branch = detect_default_branch(clone_url)
-      output = `git clone --depth=1 #{actual_branch ? "--branch #{Shellwords.escape(actual_branch)}" : ""} \
-                #{Shellwords.escape(clone_url)} #{Shellwords.escape(repo_path)} 2>&1`
+      branch_args = actual_branch ? ["--branch", actual_branch] : []
+      output = IO.popen(
+        ["git", "clone", "--depth=1", *branch_args, clone_url, repo_path],
+        err: [:child, :out], &:read
+      )
 
       if $?.success? && actual_branch
         project.update_columns(production_branch: actual_branch)
@@ -88,7 +95,7 @@ class RepositoryAnalysisJob < ApplicationJob
   end
 
   def detect_default_branch(clone_url)
-    out = `git ls-remote --symref #{Shellwords.escape(clone_url)} HEAD 2>&1`
+    out = IO.popen(["git", "ls-remote", "--symref", clone_url, "HEAD"], err: [:child, :out], &:read)
     match = out.match(%r{ref: refs/heads/(\S+)\s+HEAD})
     match&.captures&.first
   rescue
@@ -91,6 +91,28 @@ class Deployment < ApplicationRecord
     log
   end
 
+  # Batch form of append_log for streamed command output. `entries` are
+  # [message, logged_at] pairs; the whole batch is written with one INSERT and
+  # pushed to the show page in one Turbo Stream broadcast.
+  def append_logs(entries, level: "info", source: "system")
+    return [] if entries.empty?
+
+    rows = entries.map do |message, logged_at|
+      { deployment_id: id, message: message, level: level.to_s, source: source.to_s, logged_at: logged_at }
+    end
+    DeploymentLog.insert_all!(rows)
+
+    logs = rows.map { |row| DeploymentLog.new(row) }
+    Turbo::StreamsChannel.broadcast_append_to(
+      "deployment_#{id}_logs",
+      target:     "deployment_logs",
+      partial:    "deployments/log_line",
+      collection: logs,
+      as:         :log
+    )
+    logs
+  end
+
   # Wall-clock duration in seconds, nil while still running.
   def duration_seconds
     return nil unless started_at && finished_at
@@ -180,6 +180,21 @@ class User < ApplicationRecord
   # GCP credentials                                                      #
   # ------------------------------------------------------------------ #
 
+  CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform".freeze
+
+  # Returns a bearer token for Google Cloud REST APIs: the OAuth access token
+  # when connected via OAuth, otherwise one minted from the service account key.
+  def gcp_access_token
+    return fresh_google_token! if google_oauth_connected?
+
+    raise "GCP service account not configured" unless gcp_service_account_key.present?
+    credentials = Google::Auth::ServiceAccountCredentials.make_creds(
+      json_key_io: StringIO.new(gcp_service_account_key),
+      scope:       CLOUD_PLATFORM_SCOPE
+    )
+    credentials.fetch_access_token!["access_token"]
+  end
+
   # Writes the service account key to a temp file and yields the file path.
   # Cleans up the file after the block completes.
   def with_gcp_credentials_file
@@ -6,16 +6,66 @@ module Ai
   #   - files: array of {path, content, description} objects to commit
   #     (Dockerfile if missing, .dockerignore if missing, .github/workflows/deploy.yml)
   #
-  # Uses gpt-4o for high-quality code generation.
+  # Uses gpt-4o for high-quality code generation, dropping to gpt-4o-mini when
+  # the repo already has a Dockerfile and .dockerignore and only the workflow
+  # needs writing.
   # Degrades gracefully if OPENAI_API_KEY is not set.
   #
   class CicdGenerator
+    include RateLimitRetry
+
     API_URL = "https://api.openai.com/v1/chat/completions".freeze
     MODEL   = "gpt-4o".freeze
+    WORKFLOW_ONLY_MODEL = "gpt-4o-mini".freeze
     TIMEOUT = 90
+    README_BYTES = 12 * 1024
 
     Result = Struct.new(:required_secrets, :files, keyword_init: true)
 
+    SYSTEM_PROMPT = <<~PROMPT.freeze
+      You are an expert DevOps engineer generating production-ready CI/CD configuration files.
+      You will analyze a GitHub repository and produce:
+      1. A list of environment variables the user must add as GitHub repository secrets
+      2. Deployment files to commit to the repository (Dockerfile, .dockerignore, GitHub Actions workflow)
+
+      Requirements:
+      - GitHub Actions workflow must deploy to Google Cloud Run using service account authentication
+      - Workflow reads ALL secrets from GitHub repository secrets (GCP_PROJECT_ID, GCP_SA_KEY, plus app-specific vars)
+      - Generate Dockerfile only if the repo does not already have one
+      - Be framework-specific: add migration steps for Rails/Django, health checks, proper CMD, etc.
+      - Cloud Run deployment should be --allow-unauthenticated by default
+      - Use google-github-actions/auth@v2 and google-github-actions/setup-gcloud@v2
+
+      Return a JSON object with exactly these keys:
+
+      {
+        "required_secrets": [
+          {
+            "key": "SECRET_NAME",
+            "description": "What this secret is used for",
+            "example": "optional example value or hint (never real secrets)",
+            "required": true
+          }
+        ],
+        "files": [
+          {
+            "path": "relative/path/to/file",
+            "content": "full file content as a string",
+            "description": "one-line description of what this file does"
+          }
+        ]
+      }
+
+      Rules:
+      - Always include GCP_PROJECT_ID and GCP_SA_KEY in required_secrets
+      - Add framework-specific secrets (DATABASE_URL, RAILS_MASTER_KEY, SECRET_KEY_BASE, API keys, etc.)
+      - Always include .github/workflows/deploy.yml in files
+      - Include Dockerfile and .dockerignore only when the task marks them INCLUDE
+      - The workflow file must reference ALL required_secrets as ${{ secrets.KEY_NAME }}
+
+      Return ONLY a valid JSON object — no prose, no markdown fences.
+    PROMPT
+
     def initialize(project:, repo_path:, analysis_result: {})
       @project         = project
       @repo_path       = repo_path
@@ -48,41 +98,51 @@ module Ai
         f.response :json
       end
 
-      response = conn.post do |req|
-        req.headers["Authorization"] = "Bearer #{api_key}"
-        req.body = {
-          model:      MODEL,
-          max_tokens: 8192,
-          messages:   [
-            { role: "system", content: system_prompt },
-            { role: "user",   content: user_message  }
-          ]
-        }
+      response = with_rate_limit_retry do
+        conn.post do |req|
+          req.headers["Authorization"] = "Bearer #{api_key}"
+          req.body = {
+            model:      model,
+            max_tokens: 8192,
+            messages:   [
+              { role: "system", content: SYSTEM_PROMPT },
+              { role: "user",   content: user_message  }
+            ]
+          }
+        end
       end
 
       return nil unless response.success?
 
+      log_usage(response.body["usage"])
       text = response.body.dig("choices", 0, "message", "content").to_s
       parse_json_block(text)
     end
 
-    def system_prompt
-      <<~PROMPT
-        You are an expert DevOps engineer generating production-ready CI/CD configuration files.
-        You will analyze a GitHub repository and produce:
-        1. A list of environment variables the user must add as GitHub repository secrets
-        2. Deployment files to commit to the repository (Dockerfile, .dockerignore, GitHub Actions workflow)
-
-        Requirements:
-        - GitHub Actions workflow must deploy to Google Cloud Run using service account authentication
-        - Workflow reads ALL secrets from GitHub repository secrets (GCP_PROJECT_ID, GCP_SA_KEY, plus app-specific vars)
-        - Generate Dockerfile only if the repo does not already have one
-        - Be framework-specific: add migration steps for Rails/Django, health checks, proper CMD, etc.
-        - Cloud Run deployment should be --allow-unauthenticated by default
-        - Use google-github-actions/auth@v2 and google-github-actions/setup-gcloud@v2
-
-        Return ONLY a valid JSON object — no prose, no markdown fences.
-      PROMPT
+    # Records prompt size per request, so growth of the system prompt or the
+    # per-project input shows up in the logs.
+    def log_usage(usage)
+      return unless usage.is_a?(Hash)
+      Rails.logger.info(
+        "[Ai::CicdGenerator] #{model} tokens: prompt=#{usage["prompt_tokens"]} " \
+        "completion=#{usage["completion_tokens"]}"
+      )
+    end
+
+    # The workflow file alone is close to a template; only generating a
+    # Dockerfile needs the larger model.
+    def model
+      dockerfile_present? && dockerignore_present? ? WORKFLOW_ONLY_MODEL : MODEL
+    end
+
+    def dockerfile_present?
+      return @dockerfile_present if defined?(@dockerfile_present)
+      @dockerfile_present = File.exist?(File.join(@repo_path, "Dockerfile"))
+    end
+
+    def dockerignore_present?
+      return @dockerignore_present if defined?(@dockerignore_present)
+      @dockerignore_present = File.exist?(File.join(@repo_path, ".dockerignore"))
     end
 
     def user_message
@@ -98,72 +158,44 @@ module Ai
         - Port: #{@project.port || @analysis_result["port"] || 8080}
       INFO
 
-      parts << "## Repository Analysis\n```json\n#{JSON.pretty_generate(@analysis_result)}\n```"
+      parts << "## Repository Analysis\n```json\n#{JSON.generate(@analysis_result)}\n```"
 
       file_tree = build_file_tree
       if file_tree.any?
-        parts << "## File Tree (top 80 paths)\n#{file_tree.first(80).join("\n")}"
+        parts << "## File Tree (top 80 paths, grouped by directory)\n#{Analysis::FileTree.condense(file_tree.first(80))}"
       end
 
       readme = read_readme
       parts << "## README\n#{readme.first(3_000)}" if readme.present?
 
-      has_dockerfile   = File.exist?(File.join(@repo_path, "Dockerfile"))
-      has_dockerignore = File.exist?(File.join(@repo_path, ".dockerignore"))
-      has_gha_workflow = Dir.glob(File.join(@repo_path, ".github/workflows/*.yml")).any? ||
-                         Dir.glob(File.join(@repo_path, ".github/workflows/*.yaml")).any?
+      has_dockerfile   = dockerfile_present?
+      has_dockerignore = dockerignore_present?
+      has_gha_workflow = Analysis::FileTree.new(File.join(@repo_path, ".github/workflows"), max_depth: 1)
+                                           .call.any? { |f| f.end_with?(".yml", ".yaml") }
 
       parts << <<~TASK
         ## Task
         Existing files: Dockerfile=#{has_dockerfile}, .dockerignore=#{has_dockerignore}, GHA workflow=#{has_gha_workflow}
 
-        Return a JSON object with exactly these keys:
-
-        {
-          "required_secrets": [
-            {
-              "key": "SECRET_NAME",
-              "description": "What this secret is used for",
-              "example": "optional example value or hint (never real secrets)",
-              "required": true
-            }
-          ],
-          "files": [
-            {
-              "path": "relative/path/to/file",
-              "content": "full file content as a string",
-              "description": "one-line description of what this file does"
-            }
-          ]
-        }
-
-        Rules:
-        - Always include GCP_PROJECT_ID and GCP_SA_KEY in required_secrets
-        - Add framework-specific secrets (DATABASE_URL, RAILS_MASTER_KEY, SECRET_KEY_BASE, API keys, etc.)
-        - Always include .github/workflows/deploy.yml in files
-        - Only include Dockerfile in files if Dockerfile does NOT already exist (#{has_dockerfile ? "SKIP — already exists" : "INCLUDE"})
-        - Only include .dockerignore if it does NOT already exist (#{has_dockerignore ? "SKIP — already exists" : "INCLUDE"})
-        - The workflow file must reference ALL required_secrets as ${{ secrets.KEY_NAME }}
-        - For the deploy workflow: build Docker image, push to Artifact Registry (#{@project.gcp_region}-docker.pkg.dev/${{ "{{" }} secrets.GCP_PROJECT_ID {{ "}}" }}/anchor/#{@project.service_name}), deploy to Cloud Run
+        - Dockerfile: #{has_dockerfile ? "SKIP — already exists" : "INCLUDE"}
+        - .dockerignore: #{has_dockerignore ? "SKIP — already exists" : "INCLUDE"}
+        - For the deploy workflow: build Docker image, push to Artifact Registry (#{@project.gcp_region}-docker.pkg.dev/${{ secrets.GCP_PROJECT_ID }}/anchor/#{@project.service_name}), deploy to Cloud Run
       TASK
 
       parts.join("\n\n")
     end
 
     def build_file_tree
-      return [] unless @repo_path.present? && Dir.exist?(@repo_path)
-
-      Dir.glob("#{@repo_path}/**/*", File::FNM_DOTMATCH)
-         .reject { |f| File.directory?(f) }
-         .map    { |f| f.sub("#{@repo_path}/", "") }
-         .reject { |f| f.start_with?(".git/", "node_modules/", "vendor/", ".bundle/", "__pycache__/") }
+      Analysis::FileTree.new(@repo_path).call
     rescue
       []
     end
 
+    # Only the first 3,000 characters reach the prompt, so read a bounded
+    # prefix rather than the whole file.
     def read_readme
       path = Dir.glob("#{@repo_path}/README{,.md,.txt}", File::FNM_CASEFOLD).first
-      File.read(path) if path && File.exist?(path)
+      File.read(path, README_BYTES).to_s.force_encoding(Encoding::UTF_8).scrub if path && File.exist?(path)
     rescue
       nil
     end
@@ -8,10 +8,25 @@ module Ai
   # Degrades gracefully when OPENAI_API_KEY is not set.
   #
   class ErrorExplainer
+    include RateLimitRetry
+
     API_URL   = "https://api.openai.com/v1/chat/completions".freeze
     MODEL     = "gpt-4o-mini".freeze
     TIMEOUT   = 20
     MAX_CHARS = 8_000  # keep prompt cost low
+    MAX_LOGS  = 100
+    TAIL_LOGS = 30     # sent verbatim; older lines only if notable
+
+    # gcloud and git output is stored at info level, so older lines are
+    # also kept when their text reads like a warning or failure.
+    NOTABLE_LINE = /\b(error|warn(ing)?|fatal|failed)\b/i
+
+    SYSTEM_PROMPT = <<~PROMPT.freeze
+      You are a deployment expert helping developers fix failed cloud deployments.
+      Given deployment logs and an error message, provide a concise (2-4 sentences) explanation
+      of what went wrong and the most likely fix. Be specific — mention file names, environment
+      variables, or commands when relevant. Do not use markdown or bullet points.
+    PROMPT
 
     def initialize(deployment)
       @deployment = deployment
@@ -42,16 +57,18 @@ module Ai
         f.response :json
       end
 
-      response = conn.post do |req|
-        req.headers["Authorization"] = "Bearer #{api_key}"
-        req.body = {
-          model:      MODEL,
-          max_tokens: 512,
-          messages:   [
-            { role: "system", content: system_prompt },
-            { role: "user",   content: user_message  }
-          ]
-        }
+      response = with_rate_limit_retry do
+        conn.post do |req|
+          req.headers["Authorization"] = "Bearer #{api_key}"
+          req.body = {
+            model:      MODEL,
+            max_tokens: 512,
+            messages:   [
+              { role: "system", content: SYSTEM_PROMPT },
+              { role: "user",   content: user_message  }
+            ]
+          }
+        end
       end
 
       return nil unless response.success?
@@ -59,15 +76,6 @@ module Ai
       response.body.dig("choices", 0, "message", "content")
     end
 
-    def system_prompt
-      <<~PROMPT
-        You are a deployment expert helping developers fix failed cloud deployments.
-        Given deployment logs and an error message, provide a concise (2-4 sentences) explanation
-        of what went wrong and the most likely fix. Be specific — mention file names, environment
-        variables, or commands when relevant. Do not use markdown or bullet points.
-      PROMPT
-    end
-
     def user_message
       project   = @deployment.project
       framework = project.framework.presence || "unknown"
@@ -86,15 +94,38 @@ module Ai
       MSG
     end
 
+    # The lines just before the failure are sent as-is. Earlier build output
+    # is mostly progress noise, so only its warnings and errors are kept and
+    # each run of dropped lines becomes a one-line marker in its place. Runs
+    # of identical lines (retry loops, progress dots) are sent once with a
+    # repeat count.
     def recent_logs
-      @deployment
+      logs = @deployment
         .deployment_logs
         .order(logged_at: :desc)
-        .limit(100)
-        .pluck(:message)
+        .limit(MAX_LOGS)
+        .pluck(:level, :message)
         .reverse
+
+      earlier  = logs.first([logs.size - TAIL_LOGS, 0].max)
+      messages = earlier
+        .chunk_while { |a, b| notable?(*a) == notable?(*b) }
+        .flat_map do |run|
+          next run.map(&:last) if notable?(*run.first)
+
+          ["[#{run.size} #{"line".pluralize(run.size)} omitted]"]
+        end
+      messages.concat(logs.last(TAIL_LOGS).map(&:last))
+
+      messages
+        .chunk_while { |a, b| a == b }
+        .map { |run| run.size > 1 ? "#{run.first} [repeated #{run.size}x]" : run.first }
         .join("\n")
         .last(MAX_CHARS)
     end
+
+    def notable?(level, message)
+      %w[warn error].include?(level) || message.match?(NOTABLE_LINE)
+    end
   end
 end
@@ -0,0 +1,43 @@
+module Ai
+  # Retries an OpenAI request that was rate limited (HTTP 429).
+  #
+  # OpenAI sends a Retry-After header with its 429s, so we wait exactly that
+  # long (plus up to a second of jitter so concurrent jobs don't retry in
+  # lockstep) instead of guessing with a fixed backoff. Hints longer than
+  # MAX_WAIT are not worth holding a worker for — the 429 response is
+  # returned and the caller degrades as it does for any other failure.
+  #
+  module RateLimitRetry
+    MAX_RETRIES = 2
+    MAX_WAIT    = 20 # seconds
+
+    private
+
+    # Yields until the block returns a non-429 response or retries run out.
+    def with_rate_limit_retry
+      attempt = 0
+
+      loop do
+        response = yield
+        return response unless response.status == 429 && attempt < MAX_RETRIES
+
+        attempt += 1
+        wait = retry_after(response) || 2**attempt
+        return response if wait > MAX_WAIT
+
+        Rails.logger.info("[#{self.class.name}] Rate limited, retrying in #{wait.round(1)}s")
+        sleep(wait + rand)
+      end
+    end
+
+    # Retry-After is either delay-seconds or an HTTP date.
+    def retry_after(response)
+      value = response.headers["retry-after"].to_s.strip
+      return nil if value.empty?
+
+      Float(value, exception: false) || [Time.httpdate(value) - Time.now, 0].max
+    rescue ArgumentError
+      nil
+    end
+  end
+end
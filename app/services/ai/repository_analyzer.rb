@@ -13,10 +13,26 @@ module Ai
   # analysis result is returned unchanged.
   #
   class RepositoryAnalyzer
+    include RateLimitRetry
+
     API_URL = "https://api.openai.com/v1/chat/completions".freeze
     MODEL   = "gpt-4o-mini".freeze
     TIMEOUT = 30
 
+    SYSTEM_PROMPT = <<~PROMPT.freeze
+      You are an expert DevOps engineer helping analyze application repositories for cloud deployment.
+      You will receive a deterministic analysis of a repository and must return enriched insights in JSON.
+      Be concise. Return ONLY a JSON object — no prose, no markdown, no code fences.
+
+      Return a JSON object with these keys (all optional — omit keys you have no new info for):
+      - "app_description": one-sentence description of what this app does
+      - "additional_env_vars": array of {"key","required","source","description"} objects for env vars the deterministic scan missed
+      - "env_var_suggestions": array of {"key","confidence","required","reason"} where confidence is high | possible | review_required
+      - "warnings": array of additional deployment warning strings
+      - "confidence": "high" | "medium" | "low" — your confidence in the framework detection
+      - "framework_notes": brief string if you'd correct or clarify the detected framework
+    PROMPT
+
     def initialize(analysis_result, file_tree: [], readme: nil)
       @analysis_result = analysis_result
       @file_tree       = file_tree
@@ -51,16 +67,18 @@ module Ai
         f.response :json
       end
 
-      response = conn.post do |req|
-        req.headers["Authorization"] = "Bearer #{api_key}"
-        req.body = {
-          model:      MODEL,
-          max_tokens: 1024,
-          messages:   [
-            { role: "system", content: system_prompt },
-            { role: "user",   content: user_message  }
-          ]
-        }
+      response = with_rate_limit_retry do
+        conn.post do |req|
+          req.headers["Authorization"] = "Bearer #{api_key}"
+          req.body = {
+            model:      MODEL,
+            max_tokens: 1024,
+            messages:   [
+              { role: "system", content: SYSTEM_PROMPT },
+              { role: "user",   content: user_message  }
+            ]
+          }
+        end
       end
 
       return nil unless response.success?
@@ -69,37 +87,19 @@ module Ai
       parse_json_block(text)
     end
 
-    def system_prompt
-      <<~PROMPT
-        You are an expert DevOps engineer helping analyze application repositories for cloud deployment.
-        You will receive a deterministic analysis of a repository and must return enriched insights in JSON.
-        Be concise. Return ONLY a JSON object — no prose, no markdown, no code fences.
-      PROMPT
-    end
-
     def user_message
       parts = []
-      parts << "## Deterministic Analysis\n```json\n#{JSON.pretty_generate(@analysis_result)}\n```"
+      # Compact JSON: pretty-printing only adds indentation tokens.
+      parts << "## Deterministic Analysis\n```json\n#{JSON.generate(@analysis_result)}\n```"
 
       if @file_tree.any?
-        parts << "## File Tree (top 60 paths)\n#{@file_tree.first(60).join("\n")}"
+        parts << "## File Tree (top 60 paths, grouped by directory)\n#{Analysis::FileTree.condense(@file_tree.first(60))}"
       end
 
       if @readme.present?
         parts << "## README (first 2000 chars)\n#{@readme.to_s.first(2_000)}"
       end
 
-      parts << <<~PROMPT
-        ## Task
-        Return a JSON object with these keys (all optional — omit keys you have no new info for):
-        - "app_description": one-sentence description of what this app does
-        - "additional_env_vars": array of {"key","required","source","description"} objects for env vars the deterministic scan missed
-        - "env_var_suggestions": array of {"key","confidence","required","reason"} where confidence is high | possible | review_required
-        - "warnings": array of additional deployment warning strings
-        - "confidence": "high" | "medium" | "low" — your confidence in the framework detection
-        - "framework_notes": brief string if you'd correct or clarify the detected framework
-      PROMPT
-
       parts.join("\n\n")
     end
 
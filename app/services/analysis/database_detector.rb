@@ -34,9 +34,10 @@ module Analysis
       "typeorm"   => { "adapter" => "postgresql", "var" => "DATABASE_URL" },
     }.freeze
 
-    def initialize(repo_path, framework)
+    def initialize(repo_path, framework, files: RepoFiles.new(repo_path))
       @repo_path = repo_path
       @framework = framework
+      @files     = files
     end
 
     def call
@@ -50,38 +51,34 @@ module Analysis
     private
 
     def check_gemfile
-      path = File.join(@repo_path, "Gemfile")
-      return nil unless File.exist?(path)
-      content = File.read(path)
+      content = @files.read("Gemfile")
+      return nil unless content
       RUBY_ADAPTERS.each { |gem, info| return info if content.match?(/gem ['"]#{Regexp.escape(gem)}['"]/) }
       nil
     end
 
     def check_requirements
-      path = File.join(@repo_path, "requirements.txt")
-      unless File.exist?(path)
+      unless @files.exist?("requirements.txt")
         # Fall back to pyproject.toml
-        pyproj = File.join(@repo_path, "pyproject.toml")
-        return check_pyproject if File.exist?(pyproj)
+        return check_pyproject if @files.exist?("pyproject.toml")
         return nil
       end
 
-      deps = File.readlines(path).map { |l| l.split(/[>=<!~\[;\s]/)[0].strip.downcase }
+      deps = @files.read("requirements.txt").lines.map { |l| l.split(/[>=<!~\[;\s]/)[0].strip.downcase }
       PYTHON_ADAPTERS.each { |pkg, info| return info if deps.include?(pkg.downcase) }
       nil
     end
 
     def check_pyproject
-      content = File.read(File.join(@repo_path, "pyproject.toml")).downcase
+      content = @files.read("pyproject.toml").downcase
       PYTHON_ADAPTERS.each { |pkg, info| return info if content.include?(pkg.downcase) }
       nil
     end
 
     def check_package_json
-      path = File.join(@repo_path, "package.json")
-      return nil unless File.exist?(path)
+      pkg = @files.json("package.json")
+      return nil unless pkg
 
-      pkg      = JSON.parse(File.read(path))
       all_deps = (pkg["dependencies"] || {}).merge(pkg["devDependencies"] || {})
       NODE_ADAPTERS.each { |dep, info| return info if all_deps.key?(dep) }
       nil
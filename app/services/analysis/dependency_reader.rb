@@ -2,9 +2,10 @@ module Analysis
   # Reads top-level dependency names from the project's manifest file.
   # Returns a plain array of strings — used for warnings and analysis display.
   class DependencyReader
-    def initialize(repo_path, framework)
+    def initialize(repo_path, framework, files: RepoFiles.new(repo_path))
       @repo_path = repo_path
       @framework = framework
+      @files     = files
     end
 
     def call
@@ -22,28 +23,27 @@ module Analysis
     private
 
     def read_gemfile
-      path = File.join(@repo_path, "Gemfile")
-      return [] unless File.exist?(path)
+      content = @files.read("Gemfile")
+      return [] unless content
 
-      File.readlines(path)
+      content.lines
           .grep(/^\s*gem ['"]/)
           .filter_map { |l| l.match(/gem ['"]([^'"]+)['"]/)[1] rescue nil }
     end
 
     def read_requirements
-      path = File.join(@repo_path, "requirements.txt")
-      return [] unless File.exist?(path)
+      content = @files.read("requirements.txt")
+      return [] unless content
 
-      File.readlines(path)
+      content.lines
           .map    { |l| l.split(/[>=<!~\[;\s]/)[0].to_s.strip }
           .reject { |l| l.empty? || l.start_with?("#") }
     end
 
     def read_package_json
-      path = File.join(@repo_path, "package.json")
-      return [] unless File.exist?(path)
+      pkg = @files.json("package.json")
+      return [] unless pkg
 
-      pkg = JSON.parse(File.read(path))
       (pkg["dependencies"] || {}).keys
     end
   end
@@ -18,6 +18,11 @@ module Analysis
       ]
     }.freeze
 
+    # One alternation per language, so each file is scanned in a single pass
+    # instead of once per pattern. Each pattern has one capture group; the
+    # match yields nil for the groups of the alternatives that did not match.
+    SCANNERS = PATTERNS.transform_values { |patterns| Regexp.union(patterns) }.freeze
+
     # Well-known vars: we annotate these with source/required even if not found by scan,
     # as long as a related dependency is present (handled by DatabaseDetector / caller).
     KNOWN_VARS = {
@@ -44,11 +49,24 @@ module Analysis
       "DJANGO_SETTINGS_MODULE" => { source: "django",       required: false, url: nil,                                                    hint: "Python dotted path to your settings file (e.g. myapp.settings.production)" },
     }.freeze
 
-    SKIP_KEYS = %w[PORT HOST RACK_ENV RAILS_ENV NODE_ENV PYTHONUNBUFFERED].freeze
+    SKIP_KEYS = %w[PORT HOST RACK_ENV RAILS_ENV NODE_ENV PYTHONUNBUFFERED].to_set.freeze
+
+    # Test code references env vars that production never needs.
+    SKIP_SOURCE_DIRS = %w[spec test].freeze
 
-    def initialize(repo_path, framework)
+    MAX_SOURCE_BYTES = 256 * 1024
+
+    SOURCE_EXTENSIONS = {
+      ruby:       %w[.rb .erb].to_set.freeze,
+      python:     %w[.py].to_set.freeze,
+      javascript: %w[.js .ts .jsx .tsx .mjs].to_set.freeze,
+      any:        %w[.rb .py .js .ts .jsx .tsx].to_set.freeze
+    }.freeze
+
+    def initialize(repo_path, framework, files: RepoFiles.new(repo_path))
       @repo_path = repo_path
       @framework = framework
+      @files     = files
     end
 
     def call
@@ -61,10 +79,10 @@ module Analysis
     def scan_source_files
       found = Set.new
       source_files.each do |file|
-        content = File.read(file, encoding: "utf-8", invalid: :replace, undef: :replace)
-        patterns_for(file).each do |pattern|
-          content.scan(pattern) { |m| found << m.first }
-        end
+        # Read only a bounded prefix — large generated or minified files
+        # would otherwise be loaded and decoded in full.
+        content = File.read(file, MAX_SOURCE_BYTES).to_s.force_encoding(Encoding::UTF_8).scrub
+        content.scan(scanner_for(file)) { |groups| found << groups.compact.first }
       rescue => e
         Rails.logger.warn("EnvVarDetector: could not read #{file}: #{e.message}")
       end
@@ -73,23 +91,30 @@ module Analysis
 
     def source_files
       exts = case @framework
-             when "rails"         then "rb,erb,yml,yaml"
-             when "python", "fastapi", "flask", "django" then "py,env.example,.env.example"
-             when "node", "nextjs" then "js,ts,jsx,tsx,mjs"
-             else "rb,py,js,ts,jsx,tsx"
+             when "rails"         then SOURCE_EXTENSIONS[:ruby]
+             when "python", "fastapi", "flask", "django" then SOURCE_EXTENSIONS[:python]
+             when "node", "nextjs" then SOURCE_EXTENSIONS[:javascript]
+             else SOURCE_EXTENSIONS[:any]
              end
 
-      Dir.glob(File.join(@repo_path, "**", "*.{#{exts}}"))
-         .reject { |f| f =~ %r{/(node_modules|\.git|vendor|\.bundle|__pycache__|spec|test)/} }
-         .first(300)
+      # Filter the shared listing rather than walking the repo a second time.
+      @files.tree
+            .select { |f| exts.include?(File.extname(f)) && !test_path?(f) }
+            .first(300)
+            .map { |f| File.join(@repo_path, f) }
+    end
+
+    def test_path?(relative)
+      dirs = relative.split("/")
+      dirs.pop
+      dirs.any? { |dir| SKIP_SOURCE_DIRS.include?(dir) }
     end
 
-    def patterns_for(file)
+    def scanner_for(file)
       case File.extname(file)
-      when ".rb", ".erb"       then PATTERNS[:ruby]
-      when ".py"               then PATTERNS[:python]
-      when ".js", ".ts", ".jsx", ".tsx", ".mjs" then PATTERNS[:javascript]
-      else []
+      when ".rb", ".erb"       then SCANNERS[:ruby]
+      when ".py"               then SCANNERS[:python]
+      when ".js", ".ts", ".jsx", ".tsx", ".mjs" then SCANNERS[:javascript]
       end
     end
 
@@ -0,0 +1,97 @@
+module Analysis
+  # Lists the files in a cloned repository as paths relative to its root.
+  #
+  # Dependency and build directories are skipped before they are entered, so
+  # a repo with a checked-in node_modules costs the same to scan as its own
+  # source. Hidden entries are skipped too, apart from the handful of dotfiles
+  # that matter for deployment. Each entry is lstat'ed exactly once and
+  # symlinks are skipped, whether they point at a file or a directory.
+  class FileTree
+    SKIP_DIRS = %w[
+      .git .hg .svn
+      node_modules bower_components
+      vendor .bundle
+      __pycache__ .venv venv .tox .mypy_cache .pytest_cache
+      .next .nuxt dist build coverage
+    ].to_set.freeze
+
+    # Hidden files and directories that are still worth listing.
+    DOT_ALLOW = %w[
+      .env .env.example .env.sample
+      .gitignore .dockerignore .github
+      .ruby-version .python-version .nvmrc .node-version .tool-versions
+    ].to_set.freeze
+
+    # Lowercase; entries are matched on their downcased extension.
+    SKIP_EXTENSIONS = %w[
+      .png .jpg .jpeg .gif .ico .webp .bmp
+      .pdf .zip .gz .tgz .tar .jar .war .class
+      .so .dylib .dll .exe .bin .pyc
+      .woff .woff2 .ttf .otf .eot
+      .mp3 .mp4 .mov
+      .sqlite3 .db
+    ].to_set.freeze
+
+    # Pass `max_depth: 1` to list only the root's own files with the same
+    # filters.
+    def initialize(root, max_depth: nil)
+      @root      = root
+      @max_depth = max_depth
+    end
+
+    # Returns an array of relative file paths, or [] if the root is missing.
+    # Entries are sorted by name within each directory as the walk descends,
+    # so the whole listing never has to be sorted a second time.
+    def call
+      return [] unless @root.present? && Dir.exist?(@root)
+
+      files = []
+      walk(@root, nil, files, 1)
+      files
+    end
+
+    # Formats a path list for an LLM prompt: one line per directory, its
+    # files comma-separated, so a shared prefix is spelled out only once.
+    #
+    #   condense(["Gemfile", "app/models/a.rb", "app/models/b.rb"])
+    #   # => "./: Gemfile\napp/models/: a.rb, b.rb"
+    def self.condense(paths)
+      paths.group_by { |path| File.dirname(path) }
+           .map { |dir, files| "#{dir}/: #{files.map { |f| File.basename(f) }.join(", ")}" }
+           .join("\n")
+    end
+
+    private
+
+    def walk(dir, prefix, files, depth)
+      Dir.children(dir).sort!.each do |name|
+        next if name.start_with?(".") && !DOT_ALLOW.include?(name)
+
+        path     = File.join(dir, name)
+        relative = prefix ? "#{prefix}/#{name}" : name
+
+        stat = File.lstat(path)
+        next if stat.symlink?
+
+        if stat.directory?
+          next if SKIP_DIRS.include?(name) || (@max_depth && depth >= @max_depth)
+
+          walk(path, relative, files, depth + 1)
+        elsif !skip_extension?(name)
+          files << relative
+        end
+      end
+    rescue SystemCallError => e
+      Rails.logger.warn("FileTree: could not read #{dir}: #{e.message}")
+    end
+
+    # Hot path: runs once per file. Extension-less names (Gemfile, Dockerfile,
+    # .env) return before allocating anything.
+    def skip_extension?(name)
+      dot = name.rindex(".")
+      return false unless dot&.positive?
+
+      SKIP_EXTENSIONS.include?(name[dot..].downcase)
+    end
+  end
+end
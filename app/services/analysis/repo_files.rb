@@ -0,0 +1,45 @@
+module Analysis
+  # Read-through cache over a cloned repository for a single analysis run.
+  #
+  # Framework detection and the analysis services all probe the same few
+  # manifests (Gemfile, package.json, requirements.txt). Sharing one instance
+  # means each file is checked, read and JSON-parsed at most once, and the
+  # repository is walked at most once.
+  class RepoFiles
+    attr_reader :root
+
+    def initialize(root)
+      @root   = root
+      @exists = {}
+      @reads  = {}
+      @json   = {}
+    end
+
+    def exist?(relative)
+      @exists.fetch(relative) do
+        @exists[relative] = File.exist?(File.join(@root, relative))
+      end
+    end
+
+    # Returns the file's contents, or nil if it does not exist.
+    def read(relative)
+      @reads.fetch(relative) do
+        @reads[relative] = exist?(relative) ? File.read(File.join(@root, relative)) : nil
+      end
+    end
+
+    # The FileTree listing of the repository.
+    def tree
+      @tree ||= FileTree.new(@root).call
+    end
+
+    # Returns the parsed JSON document, or nil if the file does not exist.
+    # Raises JSON::ParserError on malformed content, like JSON.parse.
+    def json(relative)
+      @json.fetch(relative) do
+        content = read(relative)
+        @json[relative] = content && JSON.parse(content)
+      end
+    end
+  end
+end
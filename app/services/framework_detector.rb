@@ -5,15 +5,14 @@ class FrameworkDetector
       framework: "docker",
       runtime:   "custom",
       port:      8080,
-      check:     ->(path) { File.exist?("#{path}/Dockerfile") }
+      check:     ->(files) { files.exist?("Dockerfile") }
     },
     {
       framework: "rails",
       runtime:   "ruby3.2",
       port:      3000,
-      check:     ->(path) {
-        File.exist?("#{path}/Gemfile") &&
-          File.read("#{path}/Gemfile").include?("rails")
+      check:     ->(files) {
+        files.read("Gemfile")&.include?("rails")
       }
     },
     # Next.js — check before generic node so package.json with "next" wins
@@ -21,9 +20,8 @@ class FrameworkDetector
       framework: "nextjs",
       runtime:   "node20",
       port:      3000,
-      check:     ->(path) {
-        pkg = "#{path}/package.json"
-        File.exist?(pkg) && JSON.parse(File.read(pkg)).dig("dependencies", "next")
+      check:     ->(files) {
+        files.json("package.json")&.dig("dependencies", "next")
       }
     },
     # Bun — check before generic node (bun.lockb / bun.lock is the canonical signal)
@@ -31,26 +29,24 @@ class FrameworkDetector
       framework: "bun",
       runtime:   "bun1",
       port:      3000,
-      check:     ->(path) {
-        File.exist?("#{path}/bun.lockb") || File.exist?("#{path}/bun.lock")
+      check:     ->(files) {
+        files.exist?("bun.lockb") || files.exist?("bun.lock")
       }
     },
     {
       framework: "node",
       runtime:   "node20",
       port:      3000,
-      check:     ->(path) { File.exist?("#{path}/package.json") }
+      check:     ->(files) { files.exist?("package.json") }
     },
     # FastAPI — check before generic python
     {
       framework: "fastapi",
       runtime:   "python3.11",
       port:      8000,
-      check:     ->(path) {
-        req     = "#{path}/requirements.txt"
-        pyproj  = "#{path}/pyproject.toml"
-        (File.exist?(req)    && File.read(req).match?(/^fastapi/i)) ||
-        (File.exist?(pyproj) && File.read(pyproj).include?("fastapi"))
+      check:     ->(files) {
+        files.read("requirements.txt")&.match?(/^fastapi/i) ||
+          files.read("pyproject.toml")&.include?("fastapi")
       }
     },
     # Flask — check before generic python
@@ -58,9 +54,8 @@ class FrameworkDetector
       framework: "flask",
       runtime:   "python3.11",
       port:      5000,
-      check:     ->(path) {
-        req = "#{path}/requirements.txt"
-        File.exist?(req) && File.read(req).match?(/^flask/i)
+      check:     ->(files) {
+        files.read("requirements.txt")&.match?(/^flask/i)
       }
     },
     # Django — manage.py is the strongest signal
@@ -68,20 +63,19 @@ class FrameworkDetector
       framework: "django",
       runtime:   "python3.11",
       port:      8000,
-      check:     ->(path) {
-        req = "#{path}/requirements.txt"
-        File.exist?("#{path}/manage.py") ||
-          (File.exist?(req) && File.read(req).match?(/^django/i))
+      check:     ->(files) {
+        files.exist?("manage.py") ||
+          files.read("requirements.txt")&.match?(/^django/i)
       }
     },
     {
       framework: "python",
       runtime:   "python3.11",
       port:      8000,
-      check:     ->(path) {
-        File.exist?("#{path}/requirements.txt") ||
-          File.exist?("#{path}/pyproject.toml") ||
-          File.exist?("#{path}/setup.py")
+      check:     ->(files) {
+        files.exist?("requirements.txt") ||
+          files.exist?("pyproject.toml") ||
+          files.exist?("setup.py")
       }
     },
     # Go — check before static
@@ -89,8 +83,8 @@ class FrameworkDetector
       framework: "go",
       runtime:   "go1.22",
       port:      8080,
-      check:     ->(path) {
-        File.exist?("#{path}/go.mod")
+      check:     ->(files) {
+        files.exist?("go.mod")
       }
     },
     # Elixir / Phoenix
@@ -98,8 +92,8 @@ class FrameworkDetector
       framework: "elixir",
       runtime:   "elixir1.16",
       port:      4000,
-      check:     ->(path) {
-        File.exist?("#{path}/mix.exs")
+      check:     ->(files) {
+        files.exist?("mix.exs")
       }
     },
     # Static — only match when there are no server-side signals
@@ -107,13 +101,13 @@ class FrameworkDetector
       framework: "static",
       runtime:   "nginx",
       port:      80,
-      check:     ->(path) {
-        File.exist?("#{path}/index.html") &&
-          !File.exist?("#{path}/package.json") &&
-          !File.exist?("#{path}/requirements.txt") &&
-          !File.exist?("#{path}/Gemfile") &&
-          !File.exist?("#{path}/go.mod") &&
-          !File.exist?("#{path}/mix.exs")
+      check:     ->(files) {
+        files.exist?("index.html") &&
+          !files.exist?("package.json") &&
+          !files.exist?("requirements.txt") &&
+          !files.exist?("Gemfile") &&
+          !files.exist?("go.mod") &&
+          !files.exist?("mix.exs")
       }
     }
   ].freeze
@@ -122,13 +116,16 @@ class FrameworkDetector
 
   Result = Struct.new(:framework, :runtime, :port, :metadata, keyword_init: true)
 
-  def initialize(repo_path, project)
+  # Pass a shared Analysis::RepoFiles as `files:` to reuse manifest reads
+  # with the other analysis services.
+  def initialize(repo_path, project, files: Analysis::RepoFiles.new(repo_path))
     @repo_path = repo_path
     @project   = project
+    @files     = files
   end
 
   def call
-    detected = DETECTORS.find { |d| safe_check(d, @repo_path) } || DEFAULT
+    detected = DETECTORS.find { |d| safe_check(d) } || DEFAULT
     metadata = build_metadata(detected[:framework])
     port     = resolve_port(detected[:framework], detected[:port], metadata)
 
@@ -149,8 +146,8 @@ class FrameworkDetector
 
   private
 
-  def safe_check(detector, path)
-    detector[:check].call(path)
+  def safe_check(detector)
+    detector[:check].call(@files)
   rescue => e
     Rails.logger.warn("FrameworkDetector check failed for #{detector[:framework]}: #{e.message}")
     false
@@ -161,52 +158,52 @@ class FrameworkDetector
     when "rails"
       {
         "ruby_version"  => detect_ruby_version,
-        "bundler_lock"  => File.exist?("#{@repo_path}/Gemfile.lock")
+        "bundler_lock"  => @files.exist?("Gemfile.lock")
       }
     when "nextjs", "node"
-      package_json = JSON.parse(File.read("#{@repo_path}/package.json"))
+      package_json = @files.json("package.json")
       {
         "node_version"   => detect_node_version,
         "start_script"   => package_json.dig("scripts", "start"),
         "build_script"   => package_json.dig("scripts", "build"),
         "main"           => package_json["main"],
-        "has_lock_file"  => File.exist?("#{@repo_path}/package-lock.json") ||
-                            File.exist?("#{@repo_path}/yarn.lock") ||
-                            File.exist?("#{@repo_path}/pnpm-lock.yaml")
+        "has_lock_file"  => @files.exist?("package-lock.json") ||
+                            @files.exist?("yarn.lock") ||
+                            @files.exist?("pnpm-lock.yaml")
       }
     when "fastapi"
       {
-        "has_requirements" => File.exist?("#{@repo_path}/requirements.txt"),
+        "has_requirements" => @files.exist?("requirements.txt"),
         "entry_point"      => detect_fastapi_entry,
-        "has_procfile"     => File.exist?("#{@repo_path}/Procfile")
+        "has_procfile"     => @files.exist?("Procfile")
       }
     when "flask"
       {
-        "has_requirements" => File.exist?("#{@repo_path}/requirements.txt"),
+        "has_requirements" => @files.exist?("requirements.txt"),
         "entry_point"      => detect_python_entry,
-        "has_procfile"     => File.exist?("#{@repo_path}/Procfile")
+        "has_procfile"     => @files.exist?("Procfile")
       }
     when "django"
       {
-        "has_requirements" => File.exist?("#{@repo_path}/requirements.txt"),
-        "has_procfile"     => File.exist?("#{@repo_path}/Procfile"),
+        "has_requirements" => @files.exist?("requirements.txt"),
+        "has_procfile"     => @files.exist?("Procfile"),
         "wsgi_module"      => detect_django_wsgi
       }
     when "python"
       {
-        "has_requirements" => File.exist?("#{@repo_path}/requirements.txt"),
-        "has_pyproject"    => File.exist?("#{@repo_path}/pyproject.toml"),
-        "has_procfile"     => File.exist?("#{@repo_path}/Procfile"),
+        "has_requirements" => @files.exist?("requirements.txt"),
+        "has_pyproject"    => @files.exist?("pyproject.toml"),
+        "has_procfile"     => @files.exist?("Procfile"),
         "entry_point"      => detect_python_entry
       }
     when "go"
       {
         "go_version"    => detect_go_version,
         "module_name"   => detect_go_module,
-        "has_main"      => Dir.glob("#{@repo_path}/**/*.go").any? { |f| File.read(f).include?("func main()") rescue false }
+        "has_main"      => go_main?
       }
     when "bun"
-      pkg = JSON.parse(File.read("#{@repo_path}/package.json")) rescue {}
+      pkg = @files.json("package.json") || {} rescue {}
       {
         "start_script"  => pkg.dig("scripts", "start"),
         "build_script"  => pkg.dig("scripts", "build"),
@@ -242,13 +239,10 @@ class FrameworkDetector
   # ------------------------------------------------------------------ #
 
   def detect_ruby_version
-    version_file = "#{@repo_path}/.ruby-version"
-    gemfile_lock = "#{@repo_path}/Gemfile.lock"
-
-    if File.exist?(version_file)
-      File.read(version_file).strip
-    elsif File.exist?(gemfile_lock)
-      match = File.read(gemfile_lock).match(/RUBY VERSION\s+ruby (\d+\.\d+)/)
+    if @files.exist?(".ruby-version")
+      @files.read(".ruby-version").strip
+    elsif @files.exist?("Gemfile.lock")
+      match = @files.read("Gemfile.lock").match(/RUBY VERSION\s+ruby (\d+\.\d+)/)
       match ? match[1] : "3.2"
     else
       "3.2"
@@ -256,13 +250,10 @@ class FrameworkDetector
   end
 
   def detect_node_version
-    nvmrc = "#{@repo_path}/.nvmrc"
-    node_version_file = "#{@repo_path}/.node-version"
-
-    if File.exist?(nvmrc)
-      File.read(nvmrc).strip.delete_prefix("v")
-    elsif File.exist?(node_version_file)
-      File.read(node_version_file).strip.delete_prefix("v")
+    if @files.exist?(".nvmrc")
+      @files.read(".nvmrc").strip.delete_prefix("v")
+    elsif @files.exist?(".node-version")
+      @files.read(".node-version").strip.delete_prefix("v")
     else
       "20"
     end
@@ -270,50 +261,57 @@ class FrameworkDetector
 
   def detect_python_entry
     %w[main.py app.py wsgi.py manage.py server.py].find do |entry|
-      File.exist?("#{@repo_path}/#{entry}")
+      @files.exist?(entry)
     end
   end
 
   def detect_fastapi_entry
     # FastAPI apps typically expose an `app` object in main.py or app.py
     %w[main.py app.py server.py api.py].find do |entry|
-      path = "#{@repo_path}/#{entry}"
-      File.exist?(path) && File.read(path).include?("FastAPI")
+      @files.read(entry)&.include?("FastAPI")
     end || "main.py"
   end
 
   def detect_go_version
-    go_mod = "#{@repo_path}/go.mod"
-    return "1.22" unless File.exist?(go_mod)
-    match = File.read(go_mod).match(/^go\s+(\d+\.\d+)/)
+    go_mod = @files.read("go.mod")
+    return "1.22" unless go_mod
+    match = go_mod.match(/^go\s+(\d+\.\d+)/)
     match ? match[1] : "1.22"
   end
 
   def detect_go_module
-    go_mod = "#{@repo_path}/go.mod"
-    return nil unless File.exist?(go_mod)
-    match = File.read(go_mod).match(/^module\s+(\S+)/)
+    go_mod = @files.read("go.mod")
+    return nil unless go_mod
+    match = go_mod.match(/^module\s+(\S+)/)
     match ? match[1] : nil
   end
 
+  # The FileTree listing skips vendor/, .git and friends, which a `**/*.go`
+  # glob would crawl in full.
+  def go_main?
+    @files.tree.any? do |path|
+      path.end_with?(".go") && (File.read(File.join(@repo_path, path)).include?("func main()") rescue false)
+    end
+  end
+
   def detect_elixir_app_name
-    mix = "#{@repo_path}/mix.exs"
-    return nil unless File.exist?(mix)
-    match = File.read(mix).match(/app:\s+:(\w+)/)
+    mix = @files.read("mix.exs")
+    return nil unless mix
+    match = mix.match(/app:\s+:(\w+)/)
     match ? match[1] : nil
   end
 
   def elixir_phoenix?
-    mix = "#{@repo_path}/mix.exs"
-    return false unless File.exist?(mix)
-    File.read(mix).include?("phoenix")
+    mix = @files.read("mix.exs")
+    return false unless mix
+    mix.include?("phoenix")
   end
 
   def detect_django_wsgi
     # Try to find the wsgi module from manage.py or settings
-    manage = "#{@repo_path}/manage.py"
-    if File.exist?(manage)
-      match = File.read(manage).match(/DJANGO_SETTINGS_MODULE['"]\s*,\s*['"]([^'"]+)/)
+    manage = @files.read("manage.py")
+    if manage
+      match = manage.match(/DJANGO_SETTINGS_MODULE['"]\s*,\s*['"]([^'"]+)/)
       match ? match[1].sub(/\.settings.*/, ".wsgi") : nil
     end
   end
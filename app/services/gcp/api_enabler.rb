@@ -23,11 +23,10 @@ module Gcp
       yield "Enabling required GCP APIs for #{@gcp_project_id}…" if block_given?
 
       with_gcp_env do |env|
-        apis_joined = REQUIRED_APIS.join(" ")
-        cmd = "gcloud services enable #{apis_joined} --project=#{Shellwords.escape(@gcp_project_id)} 2>&1"
+        cmd = [Gcp::ShellEnv::GCLOUD, "services", "enable", *REQUIRED_APIS, "--project=#{@gcp_project_id}"]
 
         output_lines = []
-        IO.popen(env, cmd) do |io|
+        IO.popen(env, cmd, err: [:child, :out]) do |io|
           io.each_line do |raw|
             line = raw.chomp
             output_lines << line
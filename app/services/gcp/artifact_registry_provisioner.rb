@@ -17,33 +17,35 @@ module Gcp
       yield "Ensuring Artifact Registry repository '#{REPOSITORY_ID}' exists…" if block_given?
 
       with_gcp_env do |env|
-        # Check existence first; create only if missing.
-        describe_cmd = "gcloud artifacts repositories describe #{REPOSITORY_ID} " \
-                       "--location=#{Shellwords.escape(@region)} " \
-                       "--project=#{Shellwords.escape(@gcp_project_id)} 2>&1"
+        # Service account keys carry roles/artifactregistry.writer, which can
+        # describe the repo but not create it, so they check for it first.
+        # OAuth users normally own the GCP project: they go straight to create
+        # and treat "already exists" as success, saving the describe launch.
+        # If their create is refused, describe still decides.
+        probe_first = !@user.google_oauth_connected?
 
-        IO.popen(env, describe_cmd, &:read)
-
-        if $?.success?
+        if probe_first && repository_exists?(env)
           yield "Artifact Registry repository already exists — skipping." if block_given?
         else
-          create_cmd = "gcloud artifacts repositories create #{REPOSITORY_ID} " \
-                       "--repository-format=#{FORMAT} " \
-                       "--location=#{Shellwords.escape(@region)} " \
-                       "--project=#{Shellwords.escape(@gcp_project_id)} " \
-                       "--description='Anchor container images' 2>&1"
+          create_cmd = repositories_command(
+            "create",
+            "--repository-format=#{FORMAT}",
+            "--description=Anchor container images"
+          )
 
           output = ""
-          IO.popen(env, create_cmd) do |io|
+          IO.popen(env, create_cmd, err: [:child, :out]) do |io|
             output = io.read
           end
 
-          unless $?.success?
+          if $?.success?
+            yield "Artifact Registry repository '#{REPOSITORY_ID}' created." if block_given?
+          elsif already_exists?(output) || (!probe_first && repository_exists?(env))
+            yield "Artifact Registry repository already exists — skipping." if block_given?
+          else
             raise Gcp::ProvisioningError,
                   "Failed to create Artifact Registry repository:\n#{output.lines.last(5).join}"
           end
-
-          yield "Artifact Registry repository '#{REPOSITORY_ID}' created." if block_given?
         end
       end
 
@@ -52,6 +54,25 @@ module Gcp
 
     private
 
+    def already_exists?(output)
+      output.include?("ALREADY_EXISTS") || output.match?(/already exists/i)
+    end
+
+    def repository_exists?(env)
+      IO.popen(env, repositories_command("describe"), err: [:child, :out], &:read)
+      $?.success?
+    end
+
+    # `gcloud artifacts repositories <action>` for this region and project.
+    def repositories_command(action, *flags)
+      [
+        Gcp::ShellEnv::GCLOUD, "artifacts", "repositories", action, REPOSITORY_ID,
+        "--location=#{@region}",
+        "--project=#{@gcp_project_id}",
+        *flags
+      ]
+    end
+
     def with_gcp_env
       if @user.google_oauth_connected?
         yield Gcp::ShellEnv.with_token(@user.fresh_google_token!)
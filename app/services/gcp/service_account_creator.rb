@@ -77,7 +77,13 @@ module Gcp
       policy = policy_response.body
       bindings = policy["bindings"] || []
 
-      REQUIRED_ROLES.each do |role|
+      missing = REQUIRED_ROLES.reject do |role|
+        bindings.any? { |b| b["role"] == role && b["members"].to_a.include?(member) }
+      end
+      # Reconnecting an existing account: every role is already granted.
+      return if missing.empty?
+
+      missing.each do |role|
         binding = bindings.find { |b| b["role"] == role }
         if binding
           binding["members"] |= [member]
@@ -2,14 +2,24 @@ module Gcp
   # Builds a safe environment hash for shelling out to gcloud,
   # ensuring the binary is always findable regardless of the calling process's PATH.
   module ShellEnv
+    # Resolved once at boot by scanning PATH directly — no `which` subshell.
     GCLOUD_PATH = begin
-      dir = `which gcloud 2>/dev/null`.strip
-      dir.present? ? File.dirname(dir) : "/opt/homebrew/bin"
+      bin = ENV.fetch("PATH", "").split(File::PATH_SEPARATOR)
+               .map { |dir| File.join(dir, "gcloud") }
+               .find { |path| File.file?(path) && File.executable?(path) }
+      bin ? File.dirname(bin) : "/opt/homebrew/bin"
     end.freeze
 
+    SEARCH_PATH = "#{GCLOUD_PATH}:#{ENV.fetch('PATH', '/usr/local/bin:/usr/bin:/bin')}".freeze
+
+    # Program for argv commands. Without a shell, Ruby looks the program up on
+    # this process's PATH rather than the child env's SEARCH_PATH, so gcloud
+    # is given by absolute path.
+    GCLOUD = File.join(GCLOUD_PATH, "gcloud").freeze
+
     def self.with_key(key_path)
       {
-        "PATH"                                   => "#{GCLOUD_PATH}:#{ENV.fetch('PATH', '/usr/local/bin:/usr/bin:/bin')}",
+        "PATH"                                   => SEARCH_PATH,
         "GOOGLE_APPLICATION_CREDENTIALS"         => key_path,
         "CLOUDSDK_AUTH_CREDENTIAL_FILE_OVERRIDE" => key_path,
         "CLOUDSDK_CORE_DISABLE_PROMPTS"          => "1"
@@ -18,7 +28,7 @@ module Gcp
 
     def self.with_token(token)
       {
-        "PATH"                          => "#{GCLOUD_PATH}:#{ENV.fetch('PATH', '/usr/local/bin:/usr/bin:/bin')}",
+        "PATH"                          => SEARCH_PATH,
         "CLOUDSDK_AUTH_ACCESS_TOKEN"    => token,
         "CLOUDSDK_CORE_DISABLE_PROMPTS" => "1"
       }
@@ -3,6 +3,8 @@ module Github
   #
   # Uses the user's existing Octokit client (authenticated with their GitHub token).
   # Creates new files or updates existing ones in a single commit per file.
+  # Files whose content already matches the branch are skipped, so re-running
+  # setup does not push empty commits; their paths come back in skipped_files.
   #
   # Usage:
   #   result = Github::FileCommitter.new(
@@ -13,7 +15,7 @@ module Github
   #   ).call
   #
   class FileCommitter
-    CommitResult = Struct.new(:success, :committed_files, :error, keyword_init: true) do
+    CommitResult = Struct.new(:success, :committed_files, :skipped_files, :error, keyword_init: true) do
       def success? = success
     end
 
@@ -26,6 +28,7 @@ module Github
 
     def call
       committed = []
+      skipped   = []
 
       @files.each do |file|
         path    = file[:path] || file["path"]
@@ -33,6 +36,10 @@ module Github
         message = file[:message] || file["message"] || "Add #{path} via Anchor"
 
         sha = existing_file_sha(path)
+        if sha == blob_sha(content)
+          skipped << path
+          next
+        end
 
         if sha
           @user.github_client.update_contents(
@@ -56,15 +63,20 @@ module Github
         committed << path
       end
 
-      CommitResult.new(success: true, committed_files: committed, error: nil)
+      CommitResult.new(success: true, committed_files: committed, skipped_files: skipped, error: nil)
     rescue Octokit::Error => e
-      CommitResult.new(success: false, committed_files: [], error: e.message)
+      CommitResult.new(success: false, committed_files: [], skipped_files: [], error: e.message)
     rescue => e
-      CommitResult.new(success: false, committed_files: [], error: e.message)
+      CommitResult.new(success: false, committed_files: [], skipped_files: [], error: e.message)
     end
 
     private
 
+    # Git's object id for a blob, the same value the contents API reports.
+    def blob_sha(content)
+      Digest::SHA1.hexdigest("blob #{content.to_s.bytesize}\0#{content}")
+    end
+
     def existing_file_sha(path)
       file = @user.github_client.contents(@repo_full_name, path: path, ref: @branch)
       file[:sha]
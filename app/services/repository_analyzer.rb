@@ -11,16 +11,20 @@ class RepositoryAnalyzer
     end
   end
 
+  # Shared with the caller so follow-up steps can reuse the file listing.
+  attr_reader :files
+
   def initialize(repo_path, project)
     @repo_path = repo_path
     @project   = project
+    @files     = Analysis::RepoFiles.new(repo_path)
   end
 
   def call
-    detection = FrameworkDetector.new(@repo_path, @project).call
-    env_vars  = Analysis::EnvVarDetector.new(@repo_path, detection.framework).call
-    database  = Analysis::DatabaseDetector.new(@repo_path, detection.framework).call
-    deps      = Analysis::DependencyReader.new(@repo_path, detection.framework).call
+    detection = FrameworkDetector.new(@repo_path, @project, files: @files).call
+    env_vars  = Analysis::EnvVarDetector.new(@repo_path, detection.framework, files: @files).call
+    database  = Analysis::DatabaseDetector.new(@repo_path, detection.framework, files: @files).call
+    deps      = Analysis::DependencyReader.new(@repo_path, detection.framework, files: @files).call
 
     # If database detected, ensure DATABASE_URL is in env vars
     if database && database["var"].present?
@@ -40,7 +44,7 @@ class RepositoryAnalyzer
       detected_env_vars: env_vars,
       detected_database: database,
       dependencies:     deps,
-      has_dockerfile:   File.exist?(File.join(@repo_path, "Dockerfile")),
+      has_dockerfile:   @files.exist?("Dockerfile"),
       warnings:         build_warnings(detection, deps),
       confidence:       confidence_for(detection.framework)
     )
@@ -51,7 +55,7 @@ class RepositoryAnalyzer
   def build_warnings(detection, deps)
     warnings = []
 
-    unless File.exist?(File.join(@repo_path, "Dockerfile"))
+    unless @files.exist?("Dockerfile")
       warnings << "No Dockerfile found — Anchor will generate one for #{detection.framework}"
     end
 
@@ -72,7 +76,7 @@ class RepositoryAnalyzer
     end
 
     if detection.framework == "rails"
-      unless File.exist?(File.join(@repo_path, "config", "puma.rb"))
+      unless @files.exist?("config/puma.rb")
         warnings << "No config/puma.rb found — Anchor will use default Puma settings"
       end
     end
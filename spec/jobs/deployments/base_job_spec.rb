@@ -0,0 +1,118 @@
+require "rails_helper"
+
+RSpec.describe Deployments::BaseJob, type: :job do
+  describe "#stream_output" do
+    let(:job)          { described_class.new }
+    let(:deployment)   { instance_double(Deployment) }
+    let(:batches)      { Queue.new }
+    let(:output_lines) { [] }
+
+    before do
+      stub_const("Deployments::BaseJob::LOG_BATCH_SIZE", 3)
+      stub_const("Deployments::BaseJob::LOG_FLUSH_INTERVAL", 0.05)
+      allow(deployment).to receive(:append_logs) do |entries, source:|
+        batches << [source, entries.map(&:first)]
+      end
+    end
+
+    def stream(io)
+      job.send(:stream_output, io, deployment, "cloud_build", output_lines)
+    end
+
+    def all_batches
+      Array.new(batches.size) { batches.pop }
+    end
+
+    it "flushes full batches and the remainder at end of output" do
+      reader, writer = IO.pipe
+      writer.write((1..7).map { |i| "line #{i}\n" }.join)
+      writer.close
+
+      stream(reader)
+
+      expect(all_batches).to eq([
+        ["cloud_build", ["line 1", "line 2", "line 3"]],
+        ["cloud_build", ["line 4", "line 5", "line 6"]],
+        ["cloud_build", ["line 7"]]
+      ])
+      expect(output_lines).to eq((1..7).map { |i| "line #{i}" })
+    ensure
+      reader&.close
+    end
+
+    it "flushes a partial batch once the command goes quiet" do
+      reader, writer = IO.pipe
+      writer.write("Step 1/2\nStep 2/2\n")
+      thread = Thread.new { stream(reader) }
+
+      expect(batches.pop(timeout: 2)).to eq(["cloud_build", ["Step 1/2", "Step 2/2"]])
+
+      writer.write("DONE\n")
+      writer.close
+      thread.join(2)
+
+      expect(all_batches).to eq([["cloud_build", ["DONE"]]])
+    ensure
+      writer&.close unless writer&.closed?
+      thread&.join(2)
+      reader&.close
+    end
+
+    it "flushes finished lines while a later line is still being written" do
+      reader, writer = IO.pipe
+      writer.write("Deploying container\nCreating Revision")
+      thread = Thread.new { stream(reader) }
+
+      # gcloud's progress tracker prints dots without a newline for minutes.
+      expect(batches.pop(timeout: 2)).to eq(["cloud_build", ["Deploying container"]])
+
+      writer.write(".....done\n")
+      writer.close
+      thread.join(2)
+
+      expect(all_batches).to eq([["cloud_build", ["Creating Revision.....done"]]])
+      expect(output_lines).to eq(["Deploying container", "Creating Revision.....done"])
+    ensure
+      writer&.close unless writer&.closed?
+      thread&.join(2)
+      reader&.close
+    end
+
+    it "logs a last line that has no trailing newline" do
+      reader, writer = IO.pipe
+      writer.write("Step 1/1\nDone")
+      writer.close
+
+      stream(reader)
+
+      expect(output_lines).to eq(["Step 1/1", "Done"])
+      expect(all_batches).to eq([["cloud_build", ["Step 1/1", "Done"]]])
+    ensure
+      reader&.close
+    end
+
+    it "keeps blank lines in the output but not in the log" do
+      reader, writer = IO.pipe
+      writer.write("Building\n\nDone\n")
+      writer.close
+
+      stream(reader)
+
+      expect(output_lines).to eq(["Building", "", "Done"])
+      expect(all_batches).to eq([["cloud_build", ["Building", "Done"]]])
+    ensure
+      reader&.close
+    end
+
+    it "does not write to the log when there is no output" do
+      reader, writer = IO.pipe
+      writer.close
+
+      stream(reader)
+
+      expect(deployment).not_to have_received(:append_logs)
+    ensure
+      reader&.close
+    end
+  end
+end
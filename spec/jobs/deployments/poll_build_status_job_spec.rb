@@ -0,0 +1,91 @@
+require "rails_helper"
+
+RSpec.describe Deployments::PollBuildStatusJob, type: :job do
+  let(:project)    { create(:project) }
+  let(:deployment) { create(:deployment, :building, project: project) }
+  let(:build_url)  { "https://cloudbuild.googleapis.com/v1/projects/my-gcp-project/builds/build-123" }
+
+  before do
+    allow_any_instance_of(User).to receive(:gcp_access_token).and_return("ya29.test-token")
+  end
+
+  def stub_build(body)
+    stub_request(:get, build_url)
+      .with(headers: { "Authorization" => "Bearer ya29.test-token" })
+      .to_return(status: 200, body: body.to_json, headers: { "Content-Type" => "application/json" })
+  end
+
+  describe "#perform" do
+    context "when the build succeeded" do
+      before { stub_build("id" => "build-123", "status" => "SUCCESS") }
+
+      it "records the log URL and enqueues the Cloud Run deploy" do
+        expect {
+          described_class.new.perform(deployment.id, "build-123")
+        }.to have_enqueued_job(Deployments::DeployToCloudRunJob).with(deployment.id)
+
+        expect(deployment.reload.cloud_build_log_url)
+          .to eq("https://console.cloud.google.com/cloud-build/builds/build-123?project=my-gcp-project")
+      end
+    end
+
+    context "when the build is still running" do
+      before { stub_build("id" => "build-123", "status" => "WORKING") }
+
+      it "polls again with the next attempt number" do
+        expect {
+          described_class.new.perform(deployment.id, "build-123")
+        }.to have_enqueued_job(described_class).with(deployment.id, "build-123", attempt: 2)
+      end
+    end
+
+    context "when the build failed" do
+      before do
+        stub_build(
+          "id"          => "build-123",
+          "status"      => "FAILURE",
+          "failureInfo" => { "type" => "USER_BUILD_STEP", "detail" => "Build step 0 exited with status 1" }
+        )
+      end
+
+      it "fails the deployment with Cloud Build's failure detail" do
+        described_class.new.perform(deployment.id, "build-123")
+
+        deployment.reload
+        expect(deployment.status).to eq("failed")
+        expect(deployment.error_message).to eq("Cloud Build failure: Build step 0 exited with status 1")
+      end
+    end
+
+    context "when the Cloud Build API returns an error" do
+      before do
+        stub_request(:get, build_url)
+          .to_return(status: 403, body: { "error" => { "message" => "Permission denied" } }.to_json,
+                     headers: { "Content-Type" => "application/json" })
+      end
+
+      it "fails the deployment instead of raising" do
+        expect { described_class.new.perform(deployment.id, "build-123") }.not_to raise_error
+
+        deployment.reload
+        expect(deployment.status).to eq("failed")
+        expect(deployment.error_message).to start_with("Could not fetch build status:")
+      end
+    end
+
+    context "when the service account token cannot be fetched" do
+      before do
+        allow_any_instance_of(User).to receive(:gcp_access_token)
+          .and_raise(Signet::AuthorizationError, "invalid_grant")
+      end
+
+      it "fails the deployment instead of raising" do
+        expect { described_class.new.perform(deployment.id, "build-123") }.not_to raise_error
+
+        deployment.reload
+        expect(deployment.status).to eq("failed")
+        expect(deployment.error_message).to eq("Could not authenticate with Google Cloud: invalid_grant")
+      end
+    end
+  end
+end
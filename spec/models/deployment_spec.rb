@@ -92,6 +92,23 @@ RSpec.describe Deployment, type: :model do
     end
   end
 
+  describe "#append_logs" do
+    it "creates one record per entry with the given source" do
+      deployment = create(:deployment)
+      now = Time.current
+      expect {
+        deployment.append_logs([["Step 1/3", now], ["Step 2/3", now + 0.1]], source: "cloud_build")
+      }.to change(DeploymentLog, :count).by(2)
+      expect(deployment.deployment_logs.chronological.pluck(:message, :source))
+        .to eq([["Step 1/3", "cloud_build"], ["Step 2/3", "cloud_build"]])
+    end
+
+    it "does nothing for an empty batch" do
+      deployment = create(:deployment)
+      expect { deployment.append_logs([]) }.not_to change(DeploymentLog, :count)
+    end
+  end
+
   describe "#transition_to!" do
     it "updates the status" do
       deployment = create(:deployment, status: "pending")
@@ -72,4 +72,21 @@ RSpec.describe User, type: :model do
       expect(user.display_name).to eq("ada")
     end
   end
+
+  describe "#gcp_access_token" do
+    it "returns the OAuth access token when connected via OAuth" do
+      user = build(:user, google_access_token: "ya29.oauth",
+                          google_refresh_token: "1//refresh",
+                          google_token_expires_at: 1.hour.from_now)
+      expect(user.gcp_access_token).to eq("ya29.oauth")
+    end
+
+    it "mints a token from the service account key otherwise" do
+      user = build(:user, google_access_token: nil, gcp_service_account_key: '{"type":"service_account"}')
+      credentials = instance_double(Google::Auth::ServiceAccountCredentials,
+                                    fetch_access_token!: { "access_token" => "ya29.sa" })
+      allow(Google::Auth::ServiceAccountCredentials).to receive(:make_creds).and_return(credentials)
+      expect(user.gcp_access_token).to eq("ya29.sa")
+    end
+  end
 end
@@ -60,6 +60,7 @@ RSpec.describe Ai::ErrorExplainer do
         before do
           stub_request(:post, "https://api.openai.com/v1/chat/completions")
             .to_return(status: 429, body: "Rate limited")
+          allow(explainer).to receive(:sleep)
         end
 
         it "returns nil without raising" do
@@ -106,6 +107,64 @@ RSpec.describe Ai::ErrorExplainer do
         explainer.call
         expect(stub).to have_been_requested
       end
+
+      it "keeps only warnings and errors from logs older than the tail" do
+        # Tool output is stored at info level; only app messages use warn/error.
+        lines = [
+          ["info", "Step 1/9 : FROM ruby:3.3-slim"],
+          ["info", "npm WARN deprecated inflight"],
+          ["info", "Step 2/9 : RUN bundle install"],
+          ["info", "ERROR: failed to fetch gem index"],
+          ["error", "Hint: check the Gemfile source"]
+        ]
+        lines += Array.new(37) { |i| ["info", "build step #{i}"] }
+        start = 1.hour.ago
+        lines.each_with_index do |(level, message), i|
+          deployment.deployment_logs.create!(message: message, level: level, source: "cloud_build", logged_at: start + i.seconds)
+        end
+
+        content = nil
+        stub_request(:post, "https://api.openai.com/v1/chat/completions")
+          .with { |req| content = JSON.parse(req.body).dig("messages", 1, "content") }
+          .to_return(
+            status: 200,
+            body: { "choices" => [{ "message" => { "content" => "Some explanation" } }] }.to_json,
+            headers: { "Content-Type" => "application/json" }
+          )
+
+        explainer.call
+        expect(content).to include(
+          "[1 line omitted]\n" \
+          "npm WARN deprecated inflight\n" \
+          "[1 line omitted]\n" \
+          "ERROR: failed to fetch gem index\n" \
+          "Hint: check the Gemfile source\n" \
+          "[7 lines omitted]\n" \
+          "build step 7\n"
+        )
+        expect(content).to include("build step 36")
+        expect(content).not_to include("Step 1/9", "Step 2/9")
+        expect(content).not_to match(/^build step 6$/)
+      end
+
+      it "collapses runs of identical log lines" do
+        start = 1.hour.ago
+        ["Waiting for build...", "Waiting for build...", "Waiting for build...", "ERROR: step 2 failed"].each_with_index do |message, i|
+          deployment.deployment_logs.create!(message: message, level: "info", source: "cloud_build", logged_at: start + i.seconds)
+        end
+
+        content = nil
+        stub_request(:post, "https://api.openai.com/v1/chat/completions")
+          .with { |req| content = JSON.parse(req.body).dig("messages", 1, "content") }
+          .to_return(
+            status: 200,
+            body: { "choices" => [{ "message" => { "content" => "Some explanation" } }] }.to_json,
+            headers: { "Content-Type" => "application/json" }
+          )
+
+        explainer.call
+        expect(content).to include("Waiting for build... [repeated 3x]\nERROR: step 2 failed")
+      end
     end
   end
 end
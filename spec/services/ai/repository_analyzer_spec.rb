@@ -95,6 +95,29 @@ RSpec.describe Ai::RepositoryAnalyzer do
         end
       end
 
+      context "when the API is rate limited" do
+        it "waits for Retry-After and retries" do
+          stub_request(:post, "https://api.openai.com/v1/chat/completions")
+            .to_return(status: 429, headers: { "Retry-After" => "3" })
+            .then.to_return(
+              status: 200,
+              body: { "choices" => [{ "message" => { "content" => '{"app_description":"A simple app"}' } }] }.to_json,
+              headers: { "Content-Type" => "application/json" }
+            )
+
+          expect(analyzer).to receive(:sleep).with(be_between(3, 4))
+          expect(analyzer.call["app_description"]).to eq("A simple app")
+        end
+
+        it "gives up when the server asks for too long a wait" do
+          stub_request(:post, "https://api.openai.com/v1/chat/completions")
+            .to_return(status: 429, headers: { "Retry-After" => "120" })
+
+          expect(analyzer.call).to eq(base_result)
+          expect(a_request(:post, "https://api.openai.com/v1/chat/completions")).to have_been_made.once
+        end
+      end
+
       context "when the API times out" do
         before do
           stub_request(:post, "https://api.openai.com/v1/chat/completions")
@@ -84,6 +84,20 @@ RSpec.describe Analysis::EnvVarDetector do
         expect(keys).not_to include("VENDOR_SECRET")
       end
 
+      it "only scans the first MAX_SOURCE_BYTES of a file" do
+        padding = "#" * described_class::MAX_SOURCE_BYTES
+        write("app/models/big.rb", "ENV[\"EARLY_SECRET\"]\n#{padding}\nENV[\"LATE_SECRET\"]")
+        keys = detector.call.map { |v| v["key"] }
+        expect(keys).to include("EARLY_SECRET")
+        expect(keys).not_to include("LATE_SECRET")
+      end
+
+      it "does not read files it has no patterns for" do
+        write("config/database.yml", "url: <%= ENV[\"DATABASE_URL\"] %>")
+        expect(File).not_to receive(:read).with(end_with("database.yml"), anything)
+        detector.call
+      end
+
       it "returns an empty array when no env vars are referenced" do
         write("app/models/user.rb", "class User < ApplicationRecord; end")
         expect(detector.call).to eq([])
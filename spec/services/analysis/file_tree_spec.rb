@@ -0,0 +1,85 @@
+require "rails_helper"
+
+RSpec.describe Analysis::FileTree do
+  let(:repo_path) { Dir.mktmpdir }
+
+  after { FileUtils.rm_rf(repo_path) }
+
+  def write(filename, content = "")
+    path = File.join(repo_path, filename)
+    FileUtils.mkdir_p(File.dirname(path))
+    File.write(path, content)
+  end
+
+  subject(:tree) { described_class.new(repo_path).call }
+
+  describe "#call" do
+    it "returns relative file paths, sorted by name within each directory" do
+      write("app/models/user.rb")
+      write("app/models/account.rb")
+      write("Gemfile")
+      write("README.md")
+      expect(tree).to eq(["Gemfile", "README.md", "app/models/account.rb", "app/models/user.rb"])
+    end
+
+    it "does not list directories themselves" do
+      write("lib/tasks/seed.rake")
+      expect(tree).not_to include("lib", "lib/tasks")
+    end
+
+    it "skips dependency directories at any depth" do
+      write("node_modules/left-pad/index.js")
+      write("packages/web/node_modules/react/index.js")
+      write(".git/HEAD")
+      write("packages/web/index.js")
+      expect(tree).to eq(["packages/web/index.js"])
+    end
+
+    it "skips hidden entries except allow-listed dotfiles" do
+      write(".idea/workspace.xml")
+      write(".DS_Store")
+      write(".env.example")
+      write(".python-version", "3.12\n")
+      write(".github/workflows/ci.yml")
+      expect(tree).to eq([".env.example", ".github/workflows/ci.yml", ".python-version"])
+    end
+
+    it "stops descending at max_depth" do
+      write("Gemfile")
+      write("app/models/user.rb")
+      write("app/app.rb")
+      expect(described_class.new(repo_path, max_depth: 1).call).to eq(["Gemfile"])
+      expect(described_class.new(repo_path, max_depth: 2).call).to eq(["Gemfile", "app/app.rb"])
+    end
+
+    it "skips binary files by extension, case-insensitively" do
+      write("public/logo.PNG")
+      write("public/index.html")
+      expect(tree).to eq(["public/index.html"])
+    end
+
+    it "skips symlinks to directories and files" do
+      write("src/app.py")
+      File.symlink(File.join(repo_path, "src"), File.join(repo_path, "loop"))
+      File.symlink(File.join(repo_path, "src/app.py"), File.join(repo_path, "main.py"))
+      expect(tree).to eq(["src/app.py"])
+    end
+
+    it "returns an empty array when the root does not exist" do
+      expect(described_class.new(File.join(repo_path, "missing")).call).to eq([])
+    end
+  end
+
+  describe ".condense" do
+    it "groups files under their directory, one line per directory" do
+      paths = ["Gemfile", "README.md", "app/models/account.rb", "app/models/user.rb", "config/routes.rb"]
+      expect(described_class.condense(paths)).to eq(
+        "./: Gemfile, README.md\napp/models/: account.rb, user.rb\nconfig/: routes.rb"
+      )
+    end
+
+    it "returns an empty string for no paths" do
+      expect(described_class.condense([])).to eq("")
+    end
+  end
+end
@@ -0,0 +1,57 @@
+require "rails_helper"
+
+RSpec.describe Analysis::RepoFiles do
+  let(:repo_path) { Dir.mktmpdir }
+
+  after { FileUtils.rm_rf(repo_path) }
+
+  def write(filename, content)
+    path = File.join(repo_path, filename)
+    FileUtils.mkdir_p(File.dirname(path))
+    File.write(path, content)
+  end
+
+  subject(:files) { described_class.new(repo_path) }
+
+  describe "#read" do
+    it "returns file contents" do
+      write("Gemfile", 'gem "rails"')
+      expect(files.read("Gemfile")).to eq('gem "rails"')
+    end
+
+    it "returns nil for a missing file" do
+      expect(files.read("Gemfile")).to be_nil
+    end
+
+    it "reads each file from disk only once" do
+      write("requirements.txt", "flask")
+      expect(File).to receive(:read).once.and_call_original
+      2.times { files.read("requirements.txt") }
+    end
+  end
+
+  describe "#tree" do
+    it "walks the repository once and reuses the listing" do
+      write("app/models/user.rb", "")
+      expect(Analysis::FileTree).to receive(:new).once.and_call_original
+      2.times { expect(files.tree).to eq(["app/models/user.rb"]) }
+    end
+  end
+
+  describe "#json" do
+    it "parses and memoizes the document" do
+      write("package.json", '{"dependencies":{"next":"14.0.0"}}')
+      expect(files.json("package.json").dig("dependencies", "next")).to eq("14.0.0")
+      expect(files.json("package.json")).to equal(files.json("package.json"))
+    end
+
+    it "returns nil for a missing file" do
+      expect(files.json("package.json")).to be_nil
+    end
+
+    it "raises on malformed JSON" do
+      write("package.json", "{not json")
+      expect { files.json("package.json") }.to raise_error(JSON::ParserError)
+    end
+  end
+end
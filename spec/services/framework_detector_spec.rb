@@ -13,7 +13,9 @@ RSpec.describe FrameworkDetector do
   end
 
   def write(filename, content)
-    File.write(File.join(repo_path, filename), content)
+    path = File.join(repo_path, filename)
+    FileUtils.mkdir_p(File.dirname(path))
+    File.write(path, content)
   end
 
   describe "#call" do
@@ -188,6 +190,15 @@ RSpec.describe FrameworkDetector do
       expect(result.metadata["module_name"]).to eq("github.com/myorg/myservice")
     end
 
+    it "finds func main outside vendored packages" do
+      write("go.mod", "module example.com/app\n\ngo 1.21\n")
+      write("vendor/github.com/lib/tool/main.go", "package main\n\nfunc main() {}\n")
+      expect(subject.call.metadata["has_main"]).to be(false)
+
+      write("cmd/server/main.go", "package main\n\nfunc main() {}\n")
+      expect(described_class.new(repo_path, project).call.metadata["has_main"]).to be(true)
+    end
+
     it "prefers docker over go" do
       touch("Dockerfile")
       write("go.mod", "module example.com/app\n\ngo 1.21\n")
@@ -0,0 +1,49 @@
+require "rails_helper"
+
+RSpec.describe Github::FileCommitter do
+  let(:user)   { build(:user) }
+  let(:client) { double("Octokit::Client") }
+  let(:content) { "name: Deploy\n" }
+
+  subject(:committer) do
+    described_class.new(
+      user:           user,
+      repo_full_name: "owner/repo",
+      branch:         "main",
+      files:          [{ path: ".github/workflows/deploy.yml", content: content }]
+    )
+  end
+
+  before { allow(user).to receive(:github_client).and_return(client) }
+
+  describe "#call" do
+    it "creates files that do not exist yet" do
+      allow(client).to receive(:contents).and_raise(Octokit::NotFound)
+      expect(client).to receive(:create_contents)
+        .with("owner/repo", ".github/workflows/deploy.yml", anything, content, branch: "main")
+
+      result = committer.call
+      expect(result.committed_files).to eq([".github/workflows/deploy.yml"])
+      expect(result.skipped_files).to be_empty
+    end
+
+    it "updates files whose content differs" do
+      allow(client).to receive(:contents).and_return({ sha: "0" * 40 })
+      expect(client).to receive(:update_contents)
+        .with("owner/repo", ".github/workflows/deploy.yml", anything, "0" * 40, content, branch: "main")
+
+      committer.call
+    end
+
+    it "skips files whose content already matches the branch" do
+      blob_sha = Digest::SHA1.hexdigest("blob #{content.bytesize}\0#{content}")
+      allow(client).to receive(:contents).and_return({ sha: blob_sha })
+      expect(client).not_to receive(:update_contents)
+
+      result = committer.call
+      expect(result).to be_success
+      expect(result.committed_files).to be_empty
+      expect(result.skipped_files).to eq([".github/workflows/deploy.yml"])
+    end
+  end
+end
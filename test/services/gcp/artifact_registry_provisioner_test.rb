@@ -0,0 +1,132 @@
+require "test_helper"
+require "shellwords"
+
+class Gcp::ArtifactRegistryProvisionerTest < ActiveSupport::TestCase
+  PROJECT_ID = "my-project-123".freeze
+  REGION     = "us-central1".freeze
+
+  # Runs the provisioner against a fake `gcloud` script instead of the real CLI.
+  class FakeGcloudProvisioner < Gcp::ArtifactRegistryProvisioner
+    def initialize(bin_dir, *args)
+      super(*args)
+      @bin_dir = bin_dir
+    end
+
+    private
+
+    def with_gcp_env
+      yield({})
+    end
+
+    def repositories_command(*)
+      super.tap { |argv| argv[0] = File.join(@bin_dir, "gcloud") }
+    end
+  end
+
+  setup do
+    @bin_dir = Dir.mktmpdir
+    @calls   = File.join(@bin_dir, "calls.log")
+  end
+
+  teardown { FileUtils.rm_rf(@bin_dir) }
+
+  test "OAuth users create the repository straight away and get its URI" do
+    fake_gcloud(create: [0, "Created repository [anchor]."])
+
+    lines = []
+    uri = provision { |line| lines << line }
+
+    assert_equal "us-central1-docker.pkg.dev/#{PROJECT_ID}/anchor", uri
+    assert_includes lines, "Artifact Registry repository 'anchor' created."
+    assert_equal ["create"], gcloud_subcommands
+  end
+
+  test "OAuth users treat ALREADY_EXISTS from create as success without a describe" do
+    fake_gcloud(create: [1, "ERROR: (gcloud.artifacts.repositories.create) ALREADY_EXISTS: the repository already exists"])
+
+    lines = []
+    provision { |line| lines << line }
+
+    assert_includes lines, "Artifact Registry repository already exists — skipping."
+    assert_equal ["create"], gcloud_subcommands
+  end
+
+  test "OAuth users fall back to describe when create is not permitted" do
+    fake_gcloud(
+      create:   [1, "ERROR: (gcloud.artifacts.repositories.create) PERMISSION_DENIED: Permission 'artifactregistry.repositories.create' denied"],
+      describe: [0, "name: projects/#{PROJECT_ID}/locations/#{REGION}/repositories/anchor"]
+    )
+
+    lines = []
+    provision { |line| lines << line }
+
+    assert_includes lines, "Artifact Registry repository already exists — skipping."
+    assert_equal %w[create describe], gcloud_subcommands
+  end
+
+  test "raises when create fails and the repository does not exist" do
+    fake_gcloud(
+      create:   [1, "ERROR: (gcloud.artifacts.repositories.create) PERMISSION_DENIED: Permission denied"],
+      describe: [1, "ERROR: (gcloud.artifacts.repositories.describe) NOT_FOUND: Requested entity was not found."]
+    )
+
+    error = assert_raises(Gcp::ProvisioningError) { provision }
+    assert_includes error.message, "PERMISSION_DENIED"
+  end
+
+  test "service account users describe first and skip create when the repository exists" do
+    fake_gcloud(describe: [0, "name: projects/#{PROJECT_ID}/locations/#{REGION}/repositories/anchor"])
+
+    lines = []
+    provision(service_account_user) { |line| lines << line }
+
+    assert_includes lines, "Artifact Registry repository already exists — skipping."
+    assert_equal ["describe"], gcloud_subcommands
+  end
+
+  test "service account users create the repository when describe finds none" do
+    fake_gcloud(
+      describe: [1, "ERROR: (gcloud.artifacts.repositories.describe) NOT_FOUND: Requested entity was not found."],
+      create:   [0, "Created repository [anchor]."]
+    )
+
+    lines = []
+    provision(service_account_user) { |line| lines << line }
+
+    assert_includes lines, "Artifact Registry repository 'anchor' created."
+    assert_equal %w[describe create], gcloud_subcommands
+  end
+
+  private
+
+  def provision(user = build_user, &block)
+    FakeGcloudProvisioner.new(@bin_dir, user, PROJECT_ID, REGION).call(&block)
+  end
+
+  def service_account_user
+    build_user(google_access_token: nil, google_refresh_token: nil)
+  end
+
+  # Writes a `gcloud` script that logs its arguments and answers each
+  # `artifacts repositories <subcommand>` with the given [exit status, output].
+  def fake_gcloud(responses)
+    branches = responses.map do |subcommand, (status, output)|
+      "  #{subcommand}) echo #{Shellwords.escape(output)}; exit #{status} ;;"
+    end
+
+    path = File.join(@bin_dir, "gcloud")
+    File.write(path, <<~SH)
+      #!/bin/sh
+      echo "$3" >> #{Shellwords.escape(@calls)}
+      case "$3" in
+      #{branches.join("\n")}
+      esac
+      exit 1
+    SH
+    File.chmod(0o755, path)
+  end
+
+  def gcloud_subcommands
+    File.exist?(@calls) ? File.readlines(@calls, chomp: true) : []
+  end
+end
@@ -73,6 +73,25 @@ class Gcp::ServiceAccountCreatorTest < ActiveSupport::TestCase
     end
   end
 
+  test "skips setIamPolicy when every role is already bound" do
+    stub_service_account_creation(project_id: PROJECT_ID, email: SA_EMAIL)
+
+    bindings = Gcp::ServiceAccountCreator::REQUIRED_ROLES.map do |role|
+      { "role" => role, "members" => ["serviceAccount:#{SA_EMAIL}"] }
+    end
+    stub_request(:post, "https://cloudresourcemanager.googleapis.com/v1/projects/#{PROJECT_ID}:getIamPolicy")
+      .to_return(
+        status: 200,
+        body:   { "bindings" => bindings, "etag" => "abc" }.to_json,
+        headers: { "Content-Type" => "application/json" }
+      )
+
+    Gcp::ServiceAccountCreator.new(PROJECT_ID, ACCESS_TOKEN).call
+
+    assert_not_requested :post,
+                         "https://cloudresourcemanager.googleapis.com/v1/projects/#{PROJECT_ID}:setIamPolicy"
+  end
+
   test "raises ApiError when service account creation fails" do
     stub_request(:get, "https://iam.googleapis.com/v1/projects/#{PROJECT_ID}/serviceAccounts/#{SA_EMAIL}")
       .to_return(status: 404, body: "{}", headers: { "Content-Type" => "application/json" })